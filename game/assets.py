@@ -1,4 +1,94 @@
+import os
+import threading
 import pygame
+from collections import OrderedDict
+from time import perf_counter_ns
+from .audio import VoiceManager
+from .config import Config
+from .soundbank import open_sound_bank
+
+
+# --- LRU Cache ---
+# Bounded mapping with hit/miss/eviction counters, used for fonts and rendered text.
+class LRUCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get_or_create(self, key, factory):
+        items = self._items
+        value = items.get(key)
+        if value is not None:
+            items.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = factory()
+        items[key] = value
+        if len(items) > self.max_size:
+            items.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self._items.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# --- Sounds ---
+SOUND_DIR = "resources/sounds/misc"
+
+# Load priority: what the main menu plays first, then the game, then the slot machine
+SOUND_GROUPS = (
+    ("menu", {"prepare": "prepare.wav", "tap": "tap.wav"}),
+    (
+        "gameplay",
+        {
+            "firstblood": "firstblood.wav",
+            "humiliation": "humiliation.wav",
+            "multi_kill": "multikill.wav",
+            "mega_kill": "megakill.wav",
+            "ultra_kill": "ultrakill.wav",
+            "oneandonly": "oneandonly.wav",
+            "monster_kill": "monsterkill.wav",
+            "killing_spree": "killingspree.wav",
+            "ludacriss_kill": "ludacrisskill.wav",
+            "wicked_sick": "wickedsick.wav",
+        },
+    ),
+    (
+        "slots",
+        {
+            "gogamble": "gogamble.wav",
+            "coinhandle": "coinhandle.wav",
+            "dangit": "dangit.wav",
+            "jackpot": "jackpot.wav",
+            "godlike": "godlike.wav",
+            "holyshit": "holyshit.wav",
+            "rampage": "rampage.wav",
+            "unstoppable": "unstoppable.wav",
+        },
+    ),
+)
+SOUND_FILES = {
+    name: os.path.join(SOUND_DIR, filename)
+    for _, files in SOUND_GROUPS
+    for name, filename in files.items()
+}
 
 
 # --- Asset Manager ---
@@ -6,45 +96,117 @@ class AssetManager:
     def __init__(self):
         pygame.mixer.init()
         pygame.font.init()
-        self.sounds = {
-            "humiliation": pygame.mixer.Sound("resources/sounds/misc/humiliation.wav"),
-            "multi_kill": pygame.mixer.Sound("resources/sounds/misc/multikill.wav"),
-            "mega_kill": pygame.mixer.Sound("resources/sounds/misc/megakill.wav"),
-            "ultra_kill": pygame.mixer.Sound("resources/sounds/misc/ultrakill.wav"),
-            "monster_kill": pygame.mixer.Sound("resources/sounds/misc/monsterkill.wav"),
-            "godlike": pygame.mixer.Sound("resources/sounds/misc/godlike.wav"),
-            "holyshit": pygame.mixer.Sound("resources/sounds/misc/holyshit.wav"),
-            "killing_spree": pygame.mixer.Sound(
-                "resources/sounds/misc/killingspree.wav"
-            ),
-            "ludacriss_kill": pygame.mixer.Sound(
-                "resources/sounds/misc/ludacrisskill.wav"
-            ),
-            "rampage": pygame.mixer.Sound("resources/sounds/misc/rampage.wav"),
-            "unstoppable": pygame.mixer.Sound("resources/sounds/misc/unstoppable.wav"),
-            "wicked_sick": pygame.mixer.Sound("resources/sounds/misc/wickedsick.wav"),
-            "oneandonly": pygame.mixer.Sound("resources/sounds/misc/oneandonly.wav"),
-            "prepare": pygame.mixer.Sound("resources/sounds/misc/prepare.wav"),
-            "firstblood": pygame.mixer.Sound("resources/sounds/misc/firstblood.wav"),
-            "tap": pygame.mixer.Sound("resources/sounds/misc/tap.wav"),
-            "gogamble": pygame.mixer.Sound("resources/sounds/misc/gogamble.wav"),
-            "dangit": pygame.mixer.Sound("resources/sounds/misc/dangit.wav"),
-            "jackpot": pygame.mixer.Sound("resources/sounds/misc/jackpot.wav"),
-            "coinhandle": pygame.mixer.Sound("resources/sounds/misc/coinhandle.wav"),
-        }
+        # Sounds are decoded on first use, or ahead of time by the prefetch thread
+        self.sounds = {}
+        self.load_times = {}  # name -> decode time in ms, in load order
+        self.load_errors = {}  # name -> why the prefetch thread couldn't load it
+        self._load_lock = threading.Lock()  # One decode at a time
+        self._prefetch_thread = None
+        # Pre-decoded clips from the packed bank (game/soundbank.py) when one was
+        # built for this mixer format, else None, the WAVs are decoded and
+        # sound_bank_error says why. Clips older than their WAV are left out of it
+        if Config.SOUND_BANK_ENABLED:
+            self.sound_bank, self.sound_bank_error = open_sound_bank(files=SOUND_FILES)
+        else:
+            self.sound_bank, self.sound_bank_error = None, "disabled"
+        # Channel groups, rate limits and priorities for everything play_sound plays
+        self.voices = VoiceManager()
         self.volume = 0.01
         self.set_volume(self.volume)
 
+        self.font_cache = LRUCache(Config.FONT_CACHE_SIZE)
+        self.text_cache = LRUCache(Config.TEXT_CACHE_SIZE)
+
+        if Config.SOUND_PREFETCH:
+            self.start_prefetch()
+
+    def get_sound(self, name):
+        sound = self.sounds.get(name)
+        if sound is not None:
+            return sound
+        with self._load_lock:  # Also waits out the prefetch thread decoding it
+            sound = self.sounds.get(name)
+            if sound is None:
+                started = perf_counter_ns()
+                if self.sound_bank is not None and name in self.sound_bank:
+                    sound = self.sound_bank.sound(name)
+                else:
+                    sound = pygame.mixer.Sound(SOUND_FILES[name])
+                self.load_times[name] = (perf_counter_ns() - started) / 1e6
+                self.sounds[name] = sound
+            return sound
+
+    def start_prefetch(self):
+        # Decodes every sound on a daemon thread in SOUND_GROUPS order. With the bank
+        # open only the menu group is copied ahead; the rest are cheap to copy when
+        # first played, and copying them up front would page in the whole bank
+        if self._prefetch_thread is None:
+            self._prefetch_thread = threading.Thread(
+                target=self._prefetch, name="sound-prefetch", daemon=True
+            )
+            self._prefetch_thread.start()
+
+    def _prefetch(self):
+        if self.sound_bank is not None:
+            names = dict(SOUND_GROUPS)["menu"]
+        else:
+            names = SOUND_FILES
+        for name in names:
+            if not pygame.mixer.get_init():
+                return  # Shutting down
+            try:
+                self.get_sound(name)
+            except (pygame.error, OSError) as e:
+                # Left to fail again, loudly, on the main thread when played
+                self.load_errors[name] = str(e)
+
+    def wait_for_sounds(self, timeout=None):
+        # True once the prefetch thread is done (or was never started)
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join(timeout)
+            return not self._prefetch_thread.is_alive()
+        return True
+
+    def sound_stats(self):
+        return {
+            "loaded": len(self.sounds),
+            "total": len(SOUND_FILES),
+            "load_ms": dict(self.load_times),
+            "errors": dict(self.load_errors),
+            "bank": self.sound_bank.path if self.sound_bank else None,
+            "bank_error": self.sound_bank_error,
+            "bank_stale": list(self.sound_bank.stale) if self.sound_bank else [],
+        }
+
     def play_sound(self, name):
-        if name in self.sounds:
-            self.sounds[name].play()
+        # Returns the Channel playing it, None when the voice manager dropped it
+        if name in SOUND_FILES:
+            return self.voices.play(name, self.get_sound(name))
+        return None
 
     def set_volume(self, vol):
+        # Reaches playing sounds on the next apply_volume() or play_sound()
         self.volume = max(0.0, min(1.0, vol))
-        for sound in self.sounds.values():
-            sound.set_volume(self.volume)
+        self.voices.set_volume(self.volume)
+
+    def apply_volume(self):
         if pygame.mixer.get_init():  # Check if mixer is initialized
-            pygame.mixer.music.set_volume(self.volume)
+            self.voices.apply_volume()
 
     def get_font(self, name, size, bold=False, italic=False):
-        return pygame.font.SysFont(name, size, bold=bold, italic=italic)
+        # SysFont does a system font lookup every call, so font objects are cached
+        return self.font_cache.get_or_create(
+            (name, size, bold, italic),
+            lambda: pygame.font.SysFont(name, size, bold=bold, italic=italic),
+        )
+
+    def render_text(self, text, size, color, font_name="comicsans", bold=False):
+        # Returned surfaces are shared between callers: blit them, don't modify them
+        color = tuple(color)
+        return self.text_cache.get_or_create(
+            (text, font_name, size, color, bold),
+            lambda: self.get_font(font_name, size, bold=bold).render(text, True, color),
+        )
+
+    def cache_stats(self):
+        return {"fonts": self.font_cache.stats(), "text": self.text_cache.stats()}
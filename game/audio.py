@@ -0,0 +1,111 @@
+from time import perf_counter
+import pygame
+from .config import Config
+
+# Voice manager: every sound effect plays through it on a channel of its group
+# (SOUND_CHANNEL_GROUPS), subject to the sound's rule in SOUND_RULES:
+#   priority       a full group gives the new sound the channel of its lowest
+#                  priority (then oldest) voice, if that one isn't more important
+#   cooldown_ms    replays of the same sound within this window are dropped
+#   max_instances  copies of the same sound allowed to play at once
+# Sounds keep full volume; the master volume is a channel volume, set on the voice
+# when it starts and pushed to playing voices in one batch by apply_volume().
+
+DEFAULT_RULE = ("effects", 1, 0, 1)
+
+
+class Voice:
+    __slots__ = ("name", "priority", "started")
+
+    def __init__(self, name, priority, started):
+        self.name = name
+        self.priority = priority
+        self.started = started
+
+
+# --- Voice Manager ---
+class VoiceManager:
+    def __init__(self, groups=None, rules=None, volume=1.0):
+        groups = Config.SOUND_CHANNEL_GROUPS if groups is None else groups
+        self.rules = Config.SOUND_RULES if rules is None else rules
+        self.groups = {}  # group -> channel indices
+        first = 0
+        for group, size in groups.items():
+            self.groups[group] = range(first, first + size)
+            first += size
+        pygame.mixer.set_num_channels(first)
+        self.channels = [pygame.mixer.Channel(i) for i in range(first)]
+        self.voices = [None] * first  # Voice last started on each channel
+        self.volume = volume
+        self._volume_dirty = True
+        self._last_played = {}  # name -> perf_counter() of its last start
+        self.counters = dict.fromkeys(
+            ("played", "stolen", "cooldown", "max_instances", "no_channel"), 0
+        )
+
+    def play(self, name, sound):
+        # Returns the channel the sound started on, None when it was dropped
+        group, priority, cooldown_ms, max_instances = self.rules.get(name, DEFAULT_RULE)
+        now = perf_counter()
+        last = self._last_played.get(name)
+        if last is not None and (now - last) * 1000 < cooldown_ms:
+            self.counters["cooldown"] += 1
+            return None
+
+        free = None
+        victim = None
+        instances = 0
+        for index in self.groups[group]:
+            voice = self.voices[index]
+            if voice is None or not self.channels[index].get_busy():
+                if free is None:
+                    free = index
+                continue
+            if voice.name == name:
+                instances += 1
+            if victim is None or (voice.priority, voice.started) < (
+                self.voices[victim].priority,
+                self.voices[victim].started,
+            ):
+                victim = index
+        if instances >= max_instances:
+            self.counters["max_instances"] += 1
+            return None
+        if free is None:
+            if victim is None or self.voices[victim].priority > priority:
+                self.counters["no_channel"] += 1
+                return None
+            free = victim  # Channel.play cuts the old voice off
+            self.counters["stolen"] += 1
+
+        self.apply_volume()
+        channel = self.channels[free]
+        channel.play(sound)
+        channel.set_volume(self.volume)
+        self.voices[free] = Voice(name, priority, now)
+        self._last_played[name] = now
+        self.counters["played"] += 1
+        return channel
+
+    def set_volume(self, volume):
+        # Cheap enough for every slider motion event; applied by apply_volume()
+        self.volume = volume
+        self._volume_dirty = True
+
+    def apply_volume(self):
+        if not self._volume_dirty:
+            return
+        for channel in self.channels:
+            if channel.get_busy():
+                channel.set_volume(self.volume)
+        pygame.mixer.music.set_volume(self.volume)
+        self._volume_dirty = False
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
+        self.voices = [None] * len(self.channels)
+
+    def stats(self):
+        busy = sum(1 for channel in self.channels if channel.get_busy())
+        return dict(self.counters, channels=len(self.channels), busy=busy)
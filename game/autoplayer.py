@@ -0,0 +1,228 @@
+from .config import Config
+from .engine import WALL_KICKS
+from .shapes import SHAPE_BOUNDS, SHAPE_ROTATIONS, SHAPE_ROW_MASKS
+
+# Heuristic bot: enumerates every (rotation, column) placement reachable by rotating
+# in place and sliding sideways, optionally after a hold swap, and scores the board
+# each one leaves with a weighted sum of features. Works on the engine's bitboard
+# row masks and the compiled shape tables, no pygame, so it also runs headless.
+
+FEATURES = ("height", "lines", "holes", "bumpiness")
+LOST_SCORE = float("-inf")  # Placements that top out
+
+
+def _column_profiles():
+    # Per [shape_id][rotation]: ((dx, lowest dy), ...) for each column of the shape
+    profiles = []
+    for shape_id, rotations in enumerate(SHAPE_ROW_MASKS):
+        shape_profiles = []
+        for rotation, row_masks in enumerate(rotations):
+            min_dx, min_dy, max_dx, _ = SHAPE_BOUNDS[shape_id][rotation]
+            columns = []
+            for bit in range(max_dx - min_dx + 1):
+                rows = [i for i, mask in enumerate(row_masks) if (mask >> bit) & 1]
+                columns.append((min_dx + bit, min_dy + max(rows)))
+            shape_profiles.append(tuple(columns))
+        profiles.append(tuple(shape_profiles))
+    return tuple(profiles)
+
+
+COLUMN_PROFILES = _column_profiles()
+
+
+class Placement:
+    __slots__ = ("score", "hold", "shape_id", "rotation", "x", "y", "lines")
+
+    def __init__(self, score, hold, shape_id, rotation, x, y, lines):
+        self.score = score
+        self.hold = hold
+        self.shape_id = shape_id
+        self.rotation = rotation
+        self.x = x
+        self.y = y
+        self.lines = lines
+
+
+# --- Auto Player ---
+class AutoPlayer:
+    def __init__(self, weights=None, use_hold=True):
+        weights = Config.AUTOPLAY_WEIGHTS if weights is None else weights
+        if isinstance(weights, dict):
+            weights = [weights[name] for name in FEATURES]
+        self.weights = tuple(float(w) for w in weights)
+        self.use_hold = use_hold
+        self.target = None  # Placement being steered towards
+        self._planned_at = None  # engine.pieces_locked when the target was chosen
+        self._last_state = None
+
+    # --- Search ---
+    def best_placement(self, engine):
+        board = engine.game_logic.board
+        piece = engine.current_piece
+        best = self._search(
+            board, piece.shape_id, piece.rotation_index, piece.x, piece.y, False
+        )
+        if self.use_hold and engine.can_hold:
+            # After a hold the swapped-in piece starts over at the spawn position
+            held = engine.held_piece or engine.next_piece
+            swapped = self._search(
+                board, held.shape_id, 0, Config.GRID_COLS // 2, 1, True
+            )
+            if swapped is not None and (best is None or swapped.score > best.score):
+                best = swapped
+        return best
+
+    def _search(self, board, shape_id, rotation, x, y, hold):
+        masks, rows, cols = board.masks, board.rows, board.cols
+        fits = board.fits
+        rotations = SHAPE_ROTATIONS[shape_id]
+        bounds_table = SHAPE_BOUNDS[shape_id]
+        masks_table = SHAPE_ROW_MASKS[shape_id]
+
+        # Topmost occupied row per column (rows when empty), for drop heights
+        surface = [rows] * cols
+        covered = 0
+        for r, mask in enumerate(masks):
+            new = mask & ~covered
+            while new:
+                low = new & -new
+                surface[low.bit_length() - 1] = r
+                new ^= low
+            covered |= mask
+
+        best = None
+        for turn in range(rotations):
+            if turn:  # Rotate in place with the engine's wall kicks
+                rotation = (rotation + 1) % rotations
+                for dx, dy in WALL_KICKS:
+                    if fits(
+                        masks_table[rotation], bounds_table[rotation], x + dx, y + dy
+                    ):
+                        x, y = x + dx, y + dy
+                        break
+                else:
+                    break  # Stuck, further turns fail too
+            row_masks, bounds = masks_table[rotation], bounds_table[rotation]
+            if not fits(row_masks, bounds, x, y):
+                continue
+            profile = COLUMN_PROFILES[shape_id][rotation]
+            for target_x in _reachable_columns(fits, row_masks, bounds, x, y):
+                land_y = min(surface[target_x + dx] - 1 - dy for dx, dy in profile)
+                if land_y < y:  # Tucked under an overhang, drop it step by step
+                    land_y = y
+                    while fits(row_masks, bounds, target_x, land_y + 1):
+                        land_y += 1
+                score, lines = self._evaluate(
+                    masks,
+                    rows,
+                    cols,
+                    board.full_mask,
+                    row_masks,
+                    bounds,
+                    target_x,
+                    land_y,
+                )
+                if best is None or score > best.score:
+                    best = Placement(
+                        score, hold, shape_id, rotation, target_x, land_y, lines
+                    )
+        return best
+
+    def _evaluate(self, masks, rows, cols, full_mask, row_masks, bounds, x, y):
+        min_dx, min_dy, _, _ = bounds
+        row = y + min_dy
+        if row < 0:
+            return LOST_SCORE, 0
+        board = masks[:]
+        shift = x + min_dx
+        for shape_mask in row_masks:
+            board[row] |= shape_mask << shift
+            row += 1
+        kept = [mask for mask in board if mask != full_mask]
+        lines = rows - len(kept)
+        if lines == 0 and kept[0]:
+            return LOST_SCORE, 0  # Top row occupied, GameLogic.check_lost
+
+        heights = [0] * cols
+        holes = 0
+        covered = 0
+        top = rows - len(kept)
+        for r, mask in enumerate(kept, top):
+            new = mask & ~covered
+            while new:
+                low = new & -new
+                heights[low.bit_length() - 1] = rows - r
+                new ^= low
+            covered |= mask
+            holes += bin(covered & ~mask).count("1")
+        bumpiness = sum(abs(heights[c] - heights[c + 1]) for c in range(cols - 1))
+        w_height, w_lines, w_holes, w_bumpiness = self.weights
+        return (
+            w_height * sum(heights)
+            + w_lines * lines
+            + w_holes * holes
+            + w_bumpiness * bumpiness,
+            lines,
+        )
+
+    # --- Control ---
+    def reset(self):
+        self.target = None
+        self._planned_at = None
+        self._last_state = None
+
+    def next_action(self, engine):
+        # One engine action steering the current piece to the best placement.
+        # Re-plans for every new piece and whenever the last action had no effect.
+        piece = engine.current_piece
+        state = (
+            engine.pieces_locked,
+            engine.can_hold,
+            piece.shape_id,
+            piece.rotation_index,
+            piece.x,
+        )
+        if (
+            self.target is None
+            or self._planned_at != engine.pieces_locked
+            or state == self._last_state
+        ):
+            self.target = self.best_placement(engine)
+            self._planned_at = engine.pieces_locked
+        self._last_state = state
+
+        target = self.target
+        if target is None:
+            return "hard_drop"  # Nothing fits, end it
+        if target.hold and engine.can_hold:
+            return "hold"
+        if piece.rotation_index != target.rotation:
+            return "rotate"
+        if piece.x < target.x:
+            return "right"
+        if piece.x > target.x:
+            return "left"
+        self.target = None
+        return "hard_drop"
+
+
+def _reachable_columns(fits, row_masks, bounds, x, y):
+    # x itself, then every column reachable sliding left or right at height y
+    yield x
+    for step in (-1, 1):
+        column = x + step
+        while fits(row_masks, bounds, column, y):
+            yield column
+            column += step
+
+
+def play_game(engine, player=None, max_pieces=None, dt_ms=0):
+    # Headless game: one bot action per engine step until game over or max_pieces
+    player = AutoPlayer() if player is None else player
+    player.reset()
+    step = engine.step
+    while not engine.game_over:
+        if max_pieces is not None and engine.pieces_locked >= max_pieces:
+            break
+        step(player.next_action(engine), dt_ms)
+    return engine
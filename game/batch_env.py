@@ -0,0 +1,179 @@
+import numpy as np
+from .config import Config
+from .engine import LINE_SCORES
+from .shapes import SHAPE_CELLS, SHAPE_COUNT, SHAPE_ROTATIONS
+
+# Vectorized Tetris over N boards at once, one placement per step. Rules follow
+# GameLogic/TetrisEngine: a placement is (rotation, x) for the current piece, which
+# is hard dropped straight down from the spawn row; line clears, the level
+# multiplier and the hard-drop bonus score like TetrisEngine. Path reachability
+# (sliding under overhangs, wall kicks) is not modelled.
+
+SPAWN_Y = 1
+ROTATIONS = 4  # Shapes with fewer rotations repeat them, like Piece.rotation does
+MATRIX_ROWS = 5  # Shape cells span dy in [-4, 0]
+PAD_TOP = 4  # Rows above the playfield a spawned piece can reach
+
+
+# --- Placement Tables ---
+# PLACEMENT_MASKS[shape, rotation, xi, k] is the column bitmask the piece covers in
+# board row (y - 4 + k) when placed at x = X_MIN + xi; PLACEMENT_VALID flags the
+# (rotation, x) pairs that stay inside the walls.
+def _build_placement_tables(cols):
+    dxs = [dx for shape in SHAPE_CELLS for rot in shape for dx, _ in rot]
+    x_min = -max(dxs)
+    x_max = cols - 1 - min(dxs)
+    width = x_max - x_min + 1
+    masks = np.zeros((SHAPE_COUNT, ROTATIONS, width, MATRIX_ROWS), dtype=np.uint16)
+    valid = np.zeros((SHAPE_COUNT, ROTATIONS, width), dtype=bool)
+    for shape_id in range(SHAPE_COUNT):
+        for rotation in range(ROTATIONS):
+            cells = SHAPE_CELLS[shape_id][rotation % SHAPE_ROTATIONS[shape_id]]
+            for xi in range(width):
+                x = x_min + xi
+                if all(0 <= x + dx < cols for dx, _ in cells):
+                    valid[shape_id, rotation, xi] = True
+                    for dx, dy in cells:
+                        masks[shape_id, rotation, xi, dy + 4] |= 1 << (x + dx)
+    return x_min, width, masks, valid
+
+
+# --- Batch Environment ---
+class BatchTetrisEnv:
+    def __init__(self, num_envs, seed=None, auto_reset=True):
+        self.num_envs = num_envs
+        self.rows = Config.GRID_ROWS
+        self.cols = Config.GRID_COLS
+        self.full_mask = (1 << self.cols) - 1
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+
+        self.x_min, self.x_width, self.placement_masks, self.placement_valid = (
+            _build_placement_tables(self.cols)
+        )
+        self.num_actions = ROTATIONS * self.x_width
+
+        # Row bitmasks with PAD_TOP empty rows above the playfield and MATRIX_ROWS
+        # solid rows below it, so the floor collides like a locked row
+        height = PAD_TOP + self.rows + MATRIX_ROWS
+        self.boards = np.zeros((num_envs, height), dtype=np.uint16)
+        self.boards[:, PAD_TOP + self.rows :] = self.full_mask
+        self._column_bits = np.arange(self.cols, dtype=np.uint16)
+        self._line_scores = np.array(
+            [LINE_SCORES.get(n, 0) for n in range(MATRIX_ROWS)], dtype=np.int64
+        )
+
+        self.current = np.zeros(num_envs, dtype=np.int64)
+        self.next = np.zeros(num_envs, dtype=np.int64)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.lines = np.zeros(num_envs, dtype=np.int64)
+        self.pieces = np.zeros(num_envs, dtype=np.int64)
+        self.reset()
+
+    # --- Gym-like API ---
+    def reset(self, mask=None):
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        count = int(mask.sum())
+        self.boards[mask, : PAD_TOP + self.rows] = 0
+        self.current[mask] = self.rng.integers(0, SHAPE_COUNT, count)
+        self.next[mask] = self.rng.integers(0, SHAPE_COUNT, count)
+        self.score[mask] = 0
+        self.lines[mask] = 0
+        self.pieces[mask] = 0
+        return self.observe()
+
+    def observe(self):
+        return {
+            "board": self.board_cells(),
+            "piece": self.current.copy(),
+            "next": self.next.copy(),
+            "action_mask": self.action_mask(),
+        }
+
+    def board_cells(self):
+        # (N, rows, cols) uint8, 1 = occupied
+        rows = self.boards[:, PAD_TOP : PAD_TOP + self.rows]
+        return ((rows[:, :, None] >> self._column_bits) & 1).astype(np.uint8)
+
+    def action_mask(self):
+        # (N, num_actions): placement inside the walls and the piece fits at spawn.
+        # Only boards with blocks near the spawn rows need the full collision test.
+        mask = self.placement_valid[self.current].reshape(self.num_envs, -1).copy()
+        crowded = np.flatnonzero(
+            self.boards[:, SPAWN_Y : SPAWN_Y + MATRIX_ROWS].any(axis=1)
+        )
+        if len(crowded):
+            rotation, xi = divmod(np.arange(self.num_actions), self.x_width)
+            masks = self.placement_masks[self.current[crowded, None], rotation, xi]
+            window = self.boards[crowded, SPAWN_Y : SPAWN_Y + MATRIX_ROWS]
+            mask[crowded] &= ~((window[:, None, :] & masks) != 0).any(axis=2)
+        return mask
+
+    def decode_action(self, action):
+        rotation, xi = divmod(np.asarray(action), self.x_width)
+        return rotation, xi + self.x_min
+
+    def step(self, actions):
+        # actions: (N,) ints in [0, num_actions). Returns obs, reward, done, info.
+        actions = np.asarray(actions, dtype=np.int64)
+        env_ids = np.arange(self.num_envs)
+        rotation, xi = divmod(actions, self.x_width)
+        masks = self.placement_masks[self.current, rotation, xi]  # (N, 5)
+        valid = self.placement_valid[self.current, rotation, xi]
+
+        # Landing row: first y at or below spawn where the piece collides, minus one
+        windows = np.lib.stride_tricks.sliding_window_view(
+            self.boards, MATRIX_ROWS, axis=1
+        )[:, SPAWN_Y:]
+        collide = ((windows & masks[:, None, :]) != 0).any(axis=2)
+        first_hit = collide.argmax(axis=1)
+        placed = valid & (first_hit > 0)  # Colliding at spawn means topping out
+        landing_y = SPAWN_Y + first_hit - 1
+
+        # Lock: OR the piece rows into the board; rows above the playfield are dropped
+        rows = landing_y[:, None] + np.arange(MATRIX_ROWS)  # Padded row index
+        locked = np.where(placed[:, None], masks, 0).astype(np.uint16)
+        np.bitwise_or.at(self.boards, (env_ids[:, None], rows), locked)
+        self.boards[:, :PAD_TOP] = 0
+
+        # Line clears, compacting every board in one pass
+        field = self.boards[:, PAD_TOP : PAD_TOP + self.rows]
+        full = field == self.full_mask
+        cleared = full.sum(axis=1)
+        if cleared.any():
+            order = np.argsort(~full, axis=1, kind="stable")  # Full rows first
+            field = np.take_along_axis(field, order, axis=1)
+            field[np.arange(self.rows)[None, :] < cleared[:, None]] = 0
+            self.boards[:, PAD_TOP : PAD_TOP + self.rows] = field
+
+        # Scoring, same as TetrisEngine: hard drop bonus + line score * level
+        self.lines += cleared
+        reward = np.where(placed, (landing_y - SPAWN_Y + 1) * 2, 0)
+        reward += self._line_scores[cleared] * (self.lines // 10 + 1)
+        self.score += reward
+        self.pieces += placed
+
+        # Next piece, then the engine's game-over checks
+        self.current = np.where(placed, self.next, self.current)
+        self.next = np.where(
+            placed, self.rng.integers(0, SHAPE_COUNT, self.num_envs), self.next
+        )
+        spawn_masks = self.placement_masks[
+            self.current, 0, -self.x_min + self.cols // 2
+        ]
+        spawn_window = self.boards[:, SPAWN_Y : SPAWN_Y + MATRIX_ROWS]
+        done = (
+            ~placed
+            | ((spawn_window & spawn_masks) != 0).any(axis=1)
+            | (self.boards[:, PAD_TOP] != 0)
+        )
+
+        info = {
+            "lines_cleared": cleared,
+            "final_score": np.where(done, self.score, -1),
+            "final_lines": np.where(done, self.lines, -1),
+        }
+        if self.auto_reset and done.any():
+            self.reset(done)
+        return self.observe(), reward, done, info
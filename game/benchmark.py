@@ -0,0 +1,281 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from time import perf_counter_ns
+
+# Micro-benchmarks for the GameLogic, Renderer, PopupManager and SlotMachine hot
+# paths. Runs headless (SDL dummy video/audio drivers), writes per-op timings as
+# JSON and compares two result files to flag regressions.
+# Run with: python -m game.benchmark run --output bench.json
+#           python -m game.benchmark compare baseline.json bench.json
+
+import pygame
+from .assets import AssetManager
+from .config import Config
+from .game_logic import GameLogic
+from .piece import Piece
+from .popup import PopupManager
+from .renderer import Renderer
+from .slot_machine import SlotMachine
+from .timing import ticks_ms
+
+BENCHMARKS = {}
+
+
+def benchmark(name, batch=None):
+    # Registers setup(context) -> op. The op is timed over `number` calls per
+    # repeat; batch benchmarks get a fresh list of inputs instead, built outside
+    # the timing, and op(item) is called once per item.
+    def register(setup):
+        BENCHMARKS[name] = (setup, batch)
+        return setup
+
+    return register
+
+
+# --- Fixtures ---
+def _stack(rows, gap_column=None, color=(128, 128, 128)):
+    # locked_positions for full rows (or rows with one gap) at the given row indices
+    return {
+        (c, r): color for r in rows for c in range(Config.GRID_COLS) if c != gap_column
+    }
+
+
+def _line_clear_board(lines):
+    # `lines` full rows at the bottom under a ragged, non-clearing stack
+    logic = GameLogic()
+    bottom = Config.GRID_ROWS - 1
+    positions = _stack(range(bottom - lines + 1, bottom + 1))
+    positions.update(_stack(range(bottom - lines - 5, bottom - lines + 1), 3))
+    logic.locked_positions = positions
+    return logic
+
+
+def _busy_game_logic():
+    logic = GameLogic()
+    bottom = Config.GRID_ROWS - 1
+    positions = {}
+    for r in range(bottom - 9, bottom + 1):
+        positions.update(
+            _stack([r], gap_column=r % Config.GRID_COLS, color=(0, 255, 0))
+        )
+    logic.locked_positions = positions
+    return logic
+
+
+# --- GameLogic ---
+@benchmark("game_logic.convert_shape_format")
+def _convert_shape_format(context):
+    logic, piece = GameLogic(), Piece(5, 5, Config.T_SHAPE)
+    return lambda: logic.convert_shape_format(piece)
+
+
+@benchmark("game_logic.valid_space")
+def _valid_space(context):
+    logic = _busy_game_logic()
+    piece = Piece(5, 8, Config.L_SHAPE)
+    return lambda: logic.valid_space(piece)
+
+
+def _clear_rows(lines):
+    def setup(context):
+        return lambda: _line_clear_board(lines), lambda logic: logic.clear_rows()
+
+    return setup
+
+
+for _lines in (1, 2, 3, 4):
+    benchmark(f"game_logic.clear_rows.{_lines}_lines", batch=200)(_clear_rows(_lines))
+
+
+@benchmark("game_logic.check_lost.full_stack")
+def _check_lost(context):
+    logic = GameLogic()
+    logic.locked_positions = _stack(range(Config.GRID_ROWS), gap_column=0)
+    return logic.check_lost
+
+
+# --- Rendering ---
+@benchmark("renderer.draw_main_tetris_window")
+def _draw_main_tetris_window(context):
+    renderer = context["renderer"]
+    logic = _busy_game_logic()
+    current, next_piece, held = (
+        Piece(5, 3, Config.T_SHAPE),
+        Piece(5, 1, Config.I_SHAPE),
+        Piece(5, 1, Config.S_SHAPE),
+    )
+    upcoming = (0, 1, 2, 3)
+
+    def op():
+        renderer.draw_main_tetris_window(
+            logic.grid, 12345, current, next_piece, held, logic, upcoming
+        )
+
+    return op
+
+
+@benchmark("popup_manager.draw_popups.5_live")
+def _draw_popups(context):
+    manager = PopupManager(context["renderer"])
+    texts = ("FIRST BLOOD!", "SINGLE!", "DOUBLE!", "TRIPLE!", "TETRIS!")
+    for i, text in enumerate(texts):
+        manager.create_popup(text, size=50 + i * 10)
+    popups = manager.popups[:]
+    duration = popups[0].duration
+    surface = context["surface"]
+    elapsed = [0]
+
+    def op():
+        # Every call is one 60 fps frame later in the animation, with the popups
+        # spread evenly over their lifetime, so the grow, settle, pulse and fade
+        # phases (and the scaled frame cache filling up) are all in the timing
+        elapsed[0] += 16
+        now = ticks_ms()
+        for i, popup in enumerate(popups):
+            phase = (elapsed[0] + i * duration // len(popups)) % duration
+            popup.start_time = now - phase
+        manager.draw_popups(surface)
+
+    return op
+
+
+@benchmark("slot_machine.draw_ui")
+def _slot_draw_ui(context):
+    slot_machine = SlotMachine(
+        context["surface"], context["renderer"], context["assets"], 10_000, seed=0
+    )
+    slot_machine.result_message = "Place your bet and spin!"
+    return slot_machine._draw_ui
+
+
+# --- Runner ---
+def _time_op(op, number):
+    started = perf_counter_ns()
+    for _ in range(number):
+        op()
+    return (perf_counter_ns() - started) / number
+
+
+def _time_batch(make, op, size):
+    items = [make() for _ in range(size)]
+    started = perf_counter_ns()
+    for item in items:
+        op(item)
+    return (perf_counter_ns() - started) / size
+
+
+def run(names=None, repeats=7, min_time=0.05):
+    # SDL reads the drivers at init; an explicit choice in the environment wins
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    surface = pygame.display.set_mode((Config.S_WIDTH, Config.S_HEIGHT))
+    assets = AssetManager()
+    assets.wait_for_sounds()  # Keep the prefetch thread out of the timings
+    renderer = Renderer(surface, assets)
+    context = {"surface": surface, "assets": assets, "renderer": renderer}
+
+    results = {}
+    for name, (setup, batch) in BENCHMARKS.items():
+        if names and not any(part in name for part in names):
+            continue
+        fixture = setup(context)
+        if batch:
+            make, op = fixture
+            sample = lambda: _time_batch(make, op, batch)  # noqa: E731
+            number = batch
+        else:
+            # Calibrate so one repeat lasts about min_time
+            number = 1
+            while _time_op(fixture, number) * number < min_time * 1e9:
+                number *= 2
+            sample = lambda: _time_op(fixture, number)  # noqa: E731
+        timings = []
+        for _ in range(repeats):
+            timings.append(sample())
+            renderer.present("benchmark")  # Keep the dirty-rect lists from growing
+        results[name] = {
+            "median_ns": statistics.median(timings),
+            "min_ns": min(timings),
+            "repeats": repeats,
+            "number": number,
+        }
+        print(f"{name:<40}{results[name]['median_ns'] / 1000:>12.2f} us/op")
+    pygame.quit()
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold):
+    # Returns (lines, regressions) for benchmarks present in both result sets
+    lines, regressions = [], 0
+    lines.append(f"{'Benchmark':<40}{'Baseline us':>13}{'Current us':>13}{'Change':>9}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            lines.append(f"{name:<40}{'-':>13}{result['median_ns'] / 1000:>13.2f}")
+            continue
+        ratio = result["median_ns"] / base["median_ns"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        lines.append(
+            f"{name:<40}{base['median_ns'] / 1000:>13.2f}"
+            f"{result['median_ns'] / 1000:>13.2f}{ratio - 1:>+9.1%}{flag}"
+        )
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hot path benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--output", help="JSON results file")
+    run_parser.add_argument("--repeats", type=int, default=7)
+    run_parser.add_argument(
+        "--filter", nargs="+", help="Only benchmarks whose name contains one of these"
+    )
+    compare_parser = commands.add_parser("compare", help="Flag regressions")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Allowed slowdown (0.10 = 10%%)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run(args.filter, args.repeats)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"Results written to {args.output}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    lines, regressions = compare(baseline, current, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{regressions} regression(s) over {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
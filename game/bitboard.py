@@ -0,0 +1,122 @@
+from .config import Config
+
+EMPTY_COLOR = (0, 0, 0)
+
+
+# --- Bitboard ---
+# Each row of the playfield is an int bitmask (bit c set = column c occupied),
+# block colors are kept in a parallel rows x cols side array. The board is
+# maintained in place and records which rows changed since the last query.
+class Bitboard:
+    def __init__(self, rows=None, cols=None):
+        self.rows = Config.GRID_ROWS if rows is None else rows
+        self.cols = Config.GRID_COLS if cols is None else cols
+        self.full_mask = (1 << self.cols) - 1
+        self.masks = [0] * self.rows
+        self.colors = [[EMPTY_COLOR] * self.cols for _ in range(self.rows)]
+        self.dirty_rows = set(range(self.rows))  # Everything is new on a fresh board
+
+    def mark_all_dirty(self):
+        self.dirty_rows.update(range(self.rows))
+
+    def take_dirty_rows(self):
+        # Returns the rows changed since the previous call and resets the set
+        dirty, self.dirty_rows = self.dirty_rows, set()
+        return dirty
+
+    def is_occupied(self, col, row):
+        return (self.masks[row] >> col) & 1 == 1
+
+    def cells_fit(self, cells):
+        # cells: iterable of (col, row); rows above the playfield (row < 0) are allowed
+        masks, rows, cols = self.masks, self.rows, self.cols
+        for col, row in cells:
+            if col < 0 or col >= cols or row >= rows:
+                return False
+            if row >= 0 and (masks[row] >> col) & 1:
+                return False
+        return True
+
+    def fits(self, row_masks, bounds, x, y):
+        # Row-mask collision test for a compiled shape placed at piece position (x, y)
+        min_dx, min_dy, max_dx, max_dy = bounds
+        col = x + min_dx
+        if col < 0 or x + max_dx >= self.cols or y + max_dy >= self.rows:
+            return False
+        masks = self.masks
+        row = y + min_dy
+        for shape_mask in row_masks:
+            if row >= 0 and masks[row] & (shape_mask << col):
+                return False
+            row += 1
+        return True
+
+    def place_cells(self, cells, color):
+        # Cells outside the playfield are dropped, like the old locked_positions did
+        masks, colors, rows, cols = self.masks, self.colors, self.rows, self.cols
+        dirty_rows = self.dirty_rows
+        for col, row in cells:
+            if 0 <= col < cols and 0 <= row < rows:
+                masks[row] |= 1 << col
+                colors[row][col] = color
+                dirty_rows.add(row)
+
+    def full_rows(self):
+        full = self.full_mask
+        return [r for r, mask in enumerate(self.masks) if mask == full]
+
+    def clear_full_rows(self):
+        # Single in-place pass from the bottom up: non-full rows slide down to the
+        # write cursor, the color lists of cleared rows are blanked and reused on top.
+        full, masks, colors = self.full_mask, self.masks, self.colors
+        write = self.rows - 1
+        lowest_cleared = -1
+        recycled = []
+        for read in range(self.rows - 1, -1, -1):
+            mask = masks[read]
+            if mask == full:
+                if lowest_cleared < 0:
+                    lowest_cleared = read
+                recycled.append(colors[read])
+                continue
+            if write != read:
+                masks[write] = mask
+                colors[write] = colors[read]
+            write -= 1
+        cleared = len(recycled)
+        if cleared:
+            empty_row = [EMPTY_COLOR] * self.cols
+            for r in range(cleared):
+                masks[r] = 0
+                color_row = recycled[r]
+                color_row[:] = empty_row
+                colors[r] = color_row
+            self.dirty_rows.update(
+                range(lowest_cleared + 1)
+            )  # Everything above shifted
+        return cleared
+
+    def top_row_occupied(self, row_limit=1):
+        # True if any block sits in rows [0, row_limit)
+        return any(self.masks[:row_limit])
+
+    def occupied_cells(self):
+        for r, mask in enumerate(self.masks):
+            c = 0
+            while mask:
+                if mask & 1:
+                    yield c, r
+                mask >>= 1
+                c += 1
+
+    def to_dict(self):
+        colors = self.colors
+        return {(c, r): colors[r][c] for c, r in self.occupied_cells()}
+
+    def load_dict(self, positions):
+        self.masks[:] = [0] * self.rows
+        for color_row in self.colors:
+            color_row[:] = [EMPTY_COLOR] * self.cols
+        self.mark_all_dirty()
+        for (c, r), color in positions.items():
+            self.place_cells(((c, r),), color)
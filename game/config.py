@@ -12,6 +12,87 @@ class Config:
     GRID_ROWS = 20
     GRID_COLS = 10
 
+    # Piece randomizer ("random", "bag" or "history") and upcoming pieces queued
+    RANDOMIZER = "bag"
+    PREVIEW_COUNT = 5
+
+    # Fixed-timestep loop: engine tick length, render cap (adaptive: steps between
+    # RENDER_FPS_MIN and RENDER_FPS), catch-up and render-skip limits
+    LOGIC_TICK_MS = 10
+    RENDER_FPS = 60
+    RENDER_FPS_ADAPTIVE = False
+    RENDER_FPS_MIN = 30
+    MAX_TICKS_PER_FRAME = 25
+    MAX_SKIPPED_RENDERS = 3
+    RENDER_INTERPOLATION = True  # Smooth the falling piece between gravity rows
+
+    # Startup: initialize only the display, font and mixer subsystems instead of
+    # pygame.init() (joystick, camera, ...); the game itself is built on first use
+    STARTUP_MINIMAL_INIT = True
+
+    # Every game is recorded (seed + inputs) to REPLAY_DIR, see game/replay.py
+    REPLAY_ENABLED = True
+    REPLAY_DIR = "replays"
+
+    # Autoplayer evaluator weights (see game/autoplayer.py), toggled in game with B
+    AUTOPLAY_WEIGHTS = {
+        "height": -0.510066,
+        "lines": 0.760666,
+        "holes": -0.35663,
+        "bumpiness": -0.184483,
+    }
+    AUTOPLAY_ACTIONS_PER_FRAME = 1
+
+    # Frame profiler overlay (F3, F4 dumps CSV): frames kept, overlay refresh rate
+    PROFILER_BUFFER_SIZE = 600
+    PROFILER_REFRESH_FRAMES = 15
+    PROFILER_DIR = "profiles"
+
+    # Decode sounds on a background thread at startup (menu, gameplay, then slots)
+    # instead of only on first play
+    SOUND_PREFETCH = True
+    # Packed, pre-decoded sounds (python -m game.soundbank build); the WAVs are used
+    # when it is missing or was built for another mixer format
+    SOUND_BANK_ENABLED = True
+    SOUND_BANK = "resources/sounds/bank.snd"
+
+    # Mixer channels per group, and per sound: (group, priority, cooldown_ms,
+    # max_instances). Unlisted sounds get audio.DEFAULT_RULE, see game/audio.py
+    SOUND_CHANNEL_GROUPS = {"ui": 2, "effects": 2, "announcer": 1, "slots": 2}
+    SOUND_RULES = {
+        "tap": ("ui", 0, 60, 2),
+        "firstblood": ("effects", 1, 100, 1),
+        "prepare": ("announcer", 3, 0, 1),
+        "humiliation": ("announcer", 2, 0, 1),
+        "multi_kill": ("announcer", 3, 0, 1),
+        "mega_kill": ("announcer", 4, 0, 1),
+        "ultra_kill": ("announcer", 5, 0, 1),
+        "oneandonly": ("announcer", 6, 0, 1),
+        "godlike": ("announcer", 4, 0, 1),
+        "holyshit": ("announcer", 4, 0, 1),
+        "rampage": ("announcer", 3, 0, 1),
+        "unstoppable": ("announcer", 3, 0, 1),
+        "gogamble": ("slots", 2, 0, 1),
+        "coinhandle": ("slots", 1, 150, 1),
+        "dangit": ("slots", 2, 0, 1),
+        "jackpot": ("slots", 5, 0, 1),
+    }
+
+    # Asset caches (LRU, entries)
+    FONT_CACHE_SIZE = 32
+    TEXT_CACHE_SIZE = 256
+
+    # Dirty-rect display updates: fall back to a full flip above this share of the screen
+    DIRTY_RECTS_ENABLED = True
+    DIRTY_FULL_UPDATE_RATIO = 0.5
+
+    # Menus, pause and game over screens sleep on the event queue and only redraw
+    # on input; this is how long one wait may block
+    MENU_IDLE_TIMEOUT_MS = 1000
+
+    # Popup animation scale quantization (cached scaled frames per step)
+    POPUP_SCALE_STEP = 0.025
+
     # Shape formats
     S_SHAPE = [
         [".....", ".....", "..00.", ".00..", "....."],
@@ -59,3 +140,10 @@ class Config:
     SLOT_SYMBOLS = ["🍒", "🍊", "🍋", "🍇", "💎", "7️⃣"]
     SLOT_VALUES = {"🍒": 0, "🍊": 1, "🍋": 1.5, "🍇": 4, "💎": 25, "7️⃣": 100}
     SLOT_WEIGHTS = [40, 30, 15, 10, 4, 1]
+    # Two-of-a-kind payouts (x bet); other paying symbols use SLOT_PAIR_DEFAULT
+    SLOT_PAIR_VALUES = {"💎": 1.0, "7️⃣": 1.0}
+    SLOT_PAIR_DEFAULT = 0.5
+    SLOT_BET_OPTIONS = [100, 200, 500, 1000]
+    # Spin animation: symbols per pre-generated reel strip, ms per strip step
+    SLOT_REEL_STRIP_LENGTH = 32
+    SLOT_REEL_STEP_MS = 60
@@ -0,0 +1,85 @@
+import pygame
+from .config import Config
+
+
+# --- Dirty Rect Tracker ---
+# Collects the screen regions changed during a frame and pushes only those to the
+# display. Rects registered last frame are re-sent once so whatever moved away from
+# them gets uploaded too. Falls back to a full flip when the changed area is large,
+# on the first frame of a scene, or when explicitly requested.
+class DirtyRectTracker:
+    def __init__(self, surface, full_update_ratio=None):
+        self.surface = surface
+        self.full_update_ratio = (
+            Config.DIRTY_FULL_UPDATE_RATIO
+            if full_update_ratio is None
+            else full_update_ratio
+        )
+        self.enabled = Config.DIRTY_RECTS_ENABLED
+        self._rects = []
+        self._previous_rects = []
+        self._full_update = True
+        self._scene = None
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def add(self, rect):
+        if rect is not None:
+            self._rects.append(pygame.Rect(rect))
+
+    def mark_full(self):
+        self._full_update = True
+
+    def flush(self, scene=None):
+        if scene != self._scene:  # New scene: nothing on screen can be trusted
+            self._scene = scene
+            self._full_update = True
+
+        screen_rect = self.surface.get_rect()
+        current = []
+        for rect in self._rects:
+            rect = rect.clip(screen_rect)
+            if rect.width and rect.height:
+                current.append(rect)
+
+        full_update = self._full_update or not self.enabled
+        rects = current + self._previous_rects
+        if not full_update:
+            limit = screen_rect.width * screen_rect.height * self.full_update_ratio
+            # A moving sprite shows up in both lists with nearly the same rect, so
+            # the plain sum can double count; it's an upper bound on the union
+            # though, and only worth refining when it's over the limit
+            if sum(r.width * r.height for r in rects) > limit:
+                full_update = _union_area(rects) > limit
+
+        if full_update:
+            pygame.display.update()
+            self.full_updates += 1
+        elif rects:
+            pygame.display.update(rects)
+            self.partial_updates += 1
+
+        self._previous_rects = current
+        self._rects = []
+        self._full_update = False
+
+
+def _union_area(rects):
+    # Exact area covered by the rects: sweep the x ranges between rect edges and
+    # merge the y intervals of the rects spanning each one
+    edges = sorted({r.left for r in rects} | {r.right for r in rects})
+    area = 0
+    for left, right in zip(edges, edges[1:]):
+        spans = sorted((r.top, r.bottom) for r in rects if r.left <= left < r.right)
+        covered, top, bottom = 0, None, None
+        for span_top, span_bottom in spans:
+            if top is None or span_top > bottom:
+                if top is not None:
+                    covered += bottom - top
+                top, bottom = span_top, span_bottom
+            elif span_bottom > bottom:
+                bottom = span_bottom
+        if top is not None:
+            covered += bottom - top
+        area += covered * (right - left)
+    return area
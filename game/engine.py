@@ -0,0 +1,230 @@
+import random
+from time import perf_counter_ns
+from .config import Config
+from .game_logic import GameLogic
+from .piece import Piece
+from .randomizer import PieceQueue, create_randomizer
+
+# Pure-Python Tetris rules, no pygame: the pygame front end (TetrisGame) feeds it
+# actions and elapsed time, headless runs can call step() as fast as they like.
+
+ACTIONS = ("left", "right", "down", "rotate", "hard_drop", "hold")
+
+# Standard Tetris line scores, multiplied by the level (total_lines_cleared // 10 + 1)
+LINE_SCORES = {1: 100, 2: 300, 3: 500, 4: 800}
+
+# Simple wall kicks tried in order when a rotation collides
+WALL_KICKS = [(0, 0), (-1, 0), (1, 0), (-2, 0), (2, 0), (0, -1), (0, -2)]
+
+
+# --- Tetris Engine ---
+class TetrisEngine:
+    def __init__(self, seed=None, rng=None, randomizer=None, preview_count=None):
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.randomizer_mode = Config.RANDOMIZER if randomizer is None else randomizer
+        self.preview_count = (
+            Config.PREVIEW_COUNT if preview_count is None else preview_count
+        )
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is not None:  # Reseed, e.g. for a recorded or replayed game
+            self.seed = seed
+            self.rng = random.Random(seed)
+        self.game_logic = GameLogic()
+        self.score = 0
+        self.fall_time = 0
+        self.level_time = 0  # Time accumulator for increasing fall speed
+        self.fall_speed = 0.35  # Initial fall speed (seconds per step)
+        self.min_fall_speed = 0.05  # Fastest possible fall speed
+        self.speed_increase_interval = 15  # Increase speed every X seconds
+        self.speed_increase_amount = 0.015  # Amount to decrease fall_speed by
+
+        # Upcoming shape ids; queue.peek(0) is always next_piece
+        self.queue = PieceQueue(
+            create_randomizer(self.randomizer_mode, self.rng), self.preview_count
+        )
+        self.next_piece = None
+        self.current_piece = self._spawn_piece()
+        self.held_piece = None
+        self.can_hold = True
+        self.first_piece_placed = False
+
+        self.total_lines_cleared = 0
+        self.pieces_locked = 0
+        self.last_locked_piece = None  # Piece placed by the most recent lock
+        self.lock_ns = 0  # Total time spent locking/clearing, for the frame profiler
+        self.elapsed_ms = 0  # Simulated play time, the sum of all dt_ms
+        self.game_over = False
+        self.events = []  # (name, value) tuples produced by the last step()
+
+    @property
+    def level(self):
+        return self.total_lines_cleared // 10 + 1
+
+    def upcoming_shapes(self, count=None):
+        # Shape ids of the queued pieces, next piece first
+        return self.queue.preview(count)
+
+    def fall_progress(self, extra_ms=0):
+        # Fraction of the way to the next gravity row (0..1), extra_ms being time
+        # not simulated yet; 0 while the piece rests on something
+        piece = self.current_piece
+        piece.y += 1
+        resting = not self.game_logic.valid_space(piece)
+        piece.y -= 1
+        if resting:
+            return 0.0
+        return min(1.0, (self.fall_time + extra_ms) / (self.fall_speed * 1000))
+
+    def _spawn_piece(self):
+        piece = Piece(Config.GRID_COLS // 2, 1, self.queue.pop())
+        self.next_piece = Piece(Config.GRID_COLS // 2, 1, self.queue.peek(0))
+        return piece
+
+    # --- Stepping ---
+    def step(self, action=None, dt_ms=0):
+        # Applies one action (or None) and advances the clock by dt_ms.
+        # Returns the events produced, for the front end to turn into sound/popups:
+        #   ("move", action), ("hard_drop", distance), ("hold", None),
+        #   ("lock", lines), ("first_lock", None), ("game_over", None)
+        self.events = []
+        if self.game_over:
+            return self.events
+
+        should_lock = False
+        if action is not None:
+            should_lock = self._apply_action(action)
+        self.elapsed_ms += dt_ms
+        if not should_lock:  # If not locked by the action, check natural fall
+            should_lock = self._advance_time(dt_ms)
+        if should_lock:
+            self._lock_current_piece()
+        return self.events
+
+    def _apply_action(self, action):  # Returns True if the piece should lock
+        piece = self.current_piece
+        valid_space = self.game_logic.valid_space
+
+        if action == "left" or action == "right":
+            dx = -1 if action == "left" else 1
+            piece.x += dx
+            if not valid_space(piece):
+                piece.x -= dx  # Revert if invalid
+            else:
+                self.events.append(("move", action))
+
+        elif action == "down":  # Soft drop
+            piece.y += 1
+            if not valid_space(piece):
+                piece.y -= 1  # Revert
+                return True  # Lock if soft drop hits something
+            self.score += 1  # Small score for soft drop
+            self.fall_time = 0  # Reset fall timer for responsiveness
+
+        elif action == "rotate":
+            original_rotation = piece.rotation
+            piece.rotation = (piece.rotation + 1) % piece.rotation_count
+            for dx, dy in WALL_KICKS:
+                piece.x += dx
+                piece.y += dy
+                if valid_space(piece):
+                    self.events.append(("move", action))
+                    break
+                piece.x -= dx  # Revert kick
+                piece.y -= dy
+            else:
+                piece.rotation = original_rotation  # Revert rotation fully
+
+        elif action == "hard_drop":
+            drop_distance = 0
+            while valid_space(piece):
+                piece.y += 1
+                drop_distance += 1
+            piece.y -= 1  # Move back to last valid position
+            if drop_distance > 0:
+                self.score += drop_distance * 2  # Score for hard drop
+            self.events.append(("hard_drop", drop_distance))
+            return True
+
+        elif action == "hold":
+            self._hold_piece()
+
+        return False
+
+    def _hold_piece(self):
+        if not self.can_hold:
+            return
+        self.events.append(("hold", None))
+        # Reset position of the piece being held before swapping
+        self._reset_to_spawn(self.current_piece)
+        if self.held_piece is None:
+            self.held_piece, self.current_piece = (
+                self.current_piece,
+                self._spawn_piece(),
+            )
+        else:
+            self.held_piece, self.current_piece = self.current_piece, self.held_piece
+        # A held piece that doesn't fit is left to the next lock's game-over check
+        self._reset_to_spawn(self.current_piece)
+        self.can_hold = False
+
+    def _reset_to_spawn(self, piece):
+        piece.x = Config.GRID_COLS // 2
+        piece.y = 1  # Standard spawn y
+        piece.rotation = 0
+
+    def _advance_time(self, dt_ms):  # Returns True if the piece should lock
+        # Any dt_ms works: a long step gets every speed-up and every gravity row
+        # it covers, and time left over carries into the next step
+        self.fall_time += dt_ms
+        self.level_time += dt_ms
+
+        # Increase game speed over time
+        interval_ms = self.speed_increase_interval * 1000
+        while self.level_time > interval_ms:
+            self.level_time -= interval_ms  # Keep the rest for the next increase
+            if self.fall_speed > self.min_fall_speed:
+                self.fall_speed = max(
+                    self.min_fall_speed, self.fall_speed - self.speed_increase_amount
+                )
+
+        piece = self.current_piece
+        fall_ms = self.fall_speed * 1000
+        while self.fall_time >= fall_ms:
+            self.fall_time -= fall_ms
+            piece.y += 1
+            if not self.game_logic.valid_space(piece):
+                piece.y -= 1  # Revert move
+                self.fall_time = 0  # The next piece starts a full row away
+                return True
+        return False
+
+    def _lock_current_piece(self):
+        started = perf_counter_ns()
+        self.game_logic.lock_piece(self.current_piece)
+        self.last_locked_piece = self.current_piece
+        self.pieces_locked += 1
+
+        if not self.first_piece_placed:
+            self.events.append(("first_lock", None))
+            self.first_piece_placed = True
+
+        lines = self.game_logic.clear_rows()
+        self.total_lines_cleared += lines
+        if lines > 0:
+            self.score += LINE_SCORES.get(lines, 0) * self.level
+        self.events.append(("lock", lines))
+
+        self.current_piece = self._spawn_piece()
+        self.can_hold = True
+
+        # Game over if the new piece is immediately invalid or the stack is too high
+        if (
+            not self.game_logic.valid_space(self.current_piece)
+            or self.game_logic.check_lost()
+        ):
+            self.game_over = True
+            self.events.append(("game_over", None))
+        self.lock_ns += perf_counter_ns() - started
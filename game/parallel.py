@@ -0,0 +1,22 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Process pool fan-out shared by the offline tools (tournament, slot_sim,
+# replay_corpus). fn and the jobs must pickle, so fn is a module-level function
+# taking one job tuple.
+
+
+def parallel_map(fn, jobs, workers=None, chunksize=None):
+    # Yields fn(job) for every job, in order, as the results come in. workers
+    # defaults to one per CPU; one worker, or a single job, runs in-process. The
+    # default chunksize hands each worker about four batches
+    jobs = list(jobs)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        for job in jobs:
+            yield fn(job)
+        return
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(fn, jobs, chunksize=chunksize)
@@ -0,0 +1,38 @@
+from collections import Counter
+from .config import Config
+
+# Slot machine payout rules, pygame-free so the game, the RTP calculator and the
+# bankroll simulator all share one implementation.
+
+THREE_OF_A_KIND = "three"
+TWO_OF_A_KIND = "two"
+
+
+# --- Payout ---
+def pair_multiplier(symbol, slot_values=None, pair_values=None):
+    # Two 7s or two Diamonds pay 1x bet, two of any other paying symbol pay 0.5x
+    slot_values = Config.SLOT_VALUES if slot_values is None else slot_values
+    pair_values = Config.SLOT_PAIR_VALUES if pair_values is None else pair_values
+    if symbol in pair_values:
+        return pair_values[symbol]
+    if slot_values.get(symbol, 0) > 0:
+        return Config.SLOT_PAIR_DEFAULT
+    return 0
+
+
+def spin_payout(reels, bet_amount, slot_values=None, pair_values=None):
+    # Returns (winnings, kind, symbol, multiplier) for a 3-reel result.
+    # kind is THREE_OF_A_KIND, TWO_OF_A_KIND or None when nothing matched;
+    # a matched combination can still pay 0 (e.g. three cherries).
+    slot_values = Config.SLOT_VALUES if slot_values is None else slot_values
+    s1, s2, s3 = reels
+    if s1 == s2 == s3:  # Three of a kind
+        multiplier = slot_values.get(s1, 0)
+        return int(bet_amount * multiplier), THREE_OF_A_KIND, s1, multiplier
+
+    # Two of a kind (simple check, not all slot machine paylines)
+    for symbol, count in Counter(reels).items():
+        if count == 2:
+            multiplier = pair_multiplier(symbol, slot_values, pair_values)
+            return int(bet_amount * multiplier), TWO_OF_A_KIND, symbol, multiplier
+    return 0, None, None, 0
@@ -1,14 +1,51 @@
 from .config import Config
+from .shapes import (
+    SHAPE_BOUNDS,
+    SHAPE_CELLS,
+    SHAPE_COLORS,
+    SHAPE_ROTATIONS,
+    SHAPE_ROW_MASKS,
+    shape_id_of,
+)
 
 
 # --- Piece Class ---
+# Flyweight: a piece only stores its position, rotation and a small shape id,
+# all geometry comes from the shared tables in shapes.py.
 class Piece:
-    def __init__(self, column, row, shape_format):
+    __slots__ = ("x", "y", "shape_id", "rotation")
+
+    def __init__(self, column, row, shape):
         self.x = column
         self.y = row
-        self.shape_format = shape_format
-        self.color = Config.SHAPE_COLORS[Config.SHAPES.index(shape_format)]
+        self.shape_id = shape_id_of(shape)  # Shape id, or a Config.*_SHAPE list
         self.rotation = 0
 
+    @property
+    def color(self):
+        return SHAPE_COLORS[self.shape_id]
+
+    @property
+    def shape_format(self):
+        return Config.SHAPES[self.shape_id]
+
+    @property
+    def rotation_count(self):
+        return SHAPE_ROTATIONS[self.shape_id]
+
+    @property
+    def rotation_index(self):
+        return self.rotation % SHAPE_ROTATIONS[self.shape_id]
+
+    def get_cells(self):
+        # (dx, dy) offsets of the current rotation relative to (x, y)
+        return SHAPE_CELLS[self.shape_id][self.rotation_index]
+
+    def get_bounds(self):
+        return SHAPE_BOUNDS[self.shape_id][self.rotation_index]
+
+    def get_row_masks(self):
+        return SHAPE_ROW_MASKS[self.shape_id][self.rotation_index]
+
     def get_current_shape_matrix(self):
-        return self.shape_format[self.rotation % len(self.shape_format)]
+        return self.shape_format[self.rotation_index]
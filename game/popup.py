@@ -1,60 +1,132 @@
 import pygame
 import math
 from .config import Config
+from .timing import ticks_ms
 
 # Renderer is passed in constructor
 
 
+# --- Popup Record ---
+# Pooled, slotted popup state. `frames` caches the scaled label, glow and shadow
+# surfaces per quantized scale step so the animation only pays for each size once.
+class Popup:
+    __slots__ = (
+        "surface",
+        "glow",
+        "position",
+        "start_time",
+        "duration",
+        "scale",
+        "alpha",
+        "frames",
+    )
+
+    def __init__(self):
+        self.frames = {}
+
+    def reset(self, surface, glow, position, start_time, duration):
+        self.surface = surface
+        self.glow = glow
+        self.position = position
+        self.start_time = start_time
+        self.duration = duration
+        self.scale = 0.1  # Initial scale for animation
+        self.alpha = 255  # Initial alpha
+        self.frames.clear()
+
+    def release(self):
+        # Drop surface references so pooled records don't pin memory
+        self.surface = self.glow = None
+        self.frames.clear()
+
+    def get_frame(self, scale_step):
+        frame = self.frames.get(scale_step)
+        if frame is None:
+            scale = scale_step * Config.POPUP_SCALE_STEP
+            scaled_surface = pygame.transform.smoothscale(
+                self.surface,
+                (
+                    max(1, int(self.surface.get_width() * scale)),
+                    max(1, int(self.surface.get_height() * scale)),
+                ),
+            )
+            scaled_glow = pygame.transform.smoothscale(
+                self.glow,
+                (  # Glow slightly larger
+                    max(1, int(self.glow.get_width() * scale * 1.05)),
+                    max(1, int(self.glow.get_height() * scale * 1.05)),
+                ),
+            )
+            # Black silhouette keeping the label's per-pixel alpha; the shadow
+            # strength is applied per frame with set_alpha
+            shadow = scaled_surface.copy()
+            shadow.fill((0, 0, 0, 255), special_flags=pygame.BLEND_RGBA_MULT)
+            frame = (scaled_surface, scaled_glow, shadow)
+            self.frames[scale_step] = frame
+        return frame
+
+
 # --- Popup Manager ---
 class PopupManager:
     def __init__(self, renderer):  # renderer is a Renderer instance
         self.popups = []
+        self._pool = []  # Released Popup records, reused by create_popup
         self.renderer = renderer
 
     def create_popup(self, text, size=75, color=(255, 0, 0), duration=2000):
-        font = self.renderer.assets.get_font("impact", size, bold=True)
-        label = font.render(text, True, color)
+        label = self.renderer.assets.render_text(text, size, color, "impact", True)
 
         # Glow effect
         glow_size = int(size * 1.05)  # Slightly larger font for glow
-        glow_font = self.renderer.assets.get_font("impact", glow_size, bold=True)
         # Brighter/lighter version of the base color for glow
         glow_color = (
             min(color[0] + 50, 255),
             min(color[1] + 20, 255),
             min(color[2] + 20, 255),
         )
-        glow_label = glow_font.render(text, True, glow_color)
+        glow_label = self.renderer.assets.render_text(
+            text, glow_size, glow_color, "impact", True
+        )
 
-        popup_data = {
-            "surface": label,
-            "glow": glow_label,
-            "position": (  # Initial position, will be centered based on scaled size later
+        popup = self._pool.pop() if self._pool else Popup()
+        popup.reset(
+            label,
+            glow_label,
+            (  # Centre point, the scaled surfaces are centered on it when drawn
                 Config.S_WIDTH // 2,
                 Config.S_HEIGHT // 2 - 100,
             ),
-            "start_time": pygame.time.get_ticks(),
-            "duration": duration,
-            "scale": 0.1,  # Initial scale for animation
-            "alpha": 255,  # Initial alpha
-        }
-        self.popups.append(popup_data)
+            ticks_ms(),
+            duration,
+        )
+        self.popups.append(popup)
+
+    def clear(self):
+        for popup in self.popups:
+            popup.release()
+        self._pool.extend(self.popups)
+        self.popups.clear()
 
     def draw_popups(self, surface):
-        current_time = pygame.time.get_ticks()
-        # Remove expired popups
-        self.popups = [
-            p for p in self.popups if current_time - p["start_time"] <= p["duration"]
-        ]
+        current_time = ticks_ms()
+        # Return expired popups to the pool
+        live_popups = []
+        for popup in self.popups:
+            if current_time - popup.start_time <= popup.duration:
+                live_popups.append(popup)
+            else:
+                popup.release()
+                self._pool.append(popup)
+        self.popups = live_popups
 
         for popup in self.popups:
-            elapsed = current_time - popup["start_time"]
-            progress = elapsed / popup["duration"]
+            elapsed = current_time - popup.start_time
+            progress = elapsed / popup.duration
 
             # Animation: Scale and Alpha
             # Phase 1: Grow quickly (e.g., first 15% of duration)
             if progress < 0.15:
-                scale = min(1.2, popup["scale"] + progress * 7.5)  # Rapid growth
+                scale = min(1.2, popup.scale + progress * 7.5)  # Rapid growth
             # Phase 2: Shrink slightly to normal size (e.g., next 15%)
             elif progress < 0.3:
                 scale = max(1.0, 1.2 - (progress - 0.15) * 1.33)  # Settle back to 1.0
@@ -65,25 +137,17 @@ class PopupManager:
                 )  # Gentle pulsing
 
             # Fade out in the last 30% of duration
-            alpha = popup["alpha"]
+            alpha = popup.alpha
             if progress > 0.7:
-                alpha = int(popup["alpha"] * (1 - (progress - 0.7) / 0.3))
+                alpha = int(popup.alpha * (1 - (progress - 0.7) / 0.3))
 
             alpha = max(0, min(255, alpha))  # Clamp alpha
+            if alpha == 0:
+                continue
 
-            # Apply scale
-            scaled_width = int(popup["surface"].get_width() * scale)
-            scaled_height = int(popup["surface"].get_height() * scale)
-            scaled_surface = pygame.transform.smoothscale(
-                popup["surface"], (scaled_width, scaled_height)
-            )
-
-            scaled_glow_width = int(
-                popup["glow"].get_width() * scale * 1.05
-            )  # Glow slightly larger
-            scaled_glow_height = int(popup["glow"].get_height() * scale * 1.05)
-            scaled_glow = pygame.transform.smoothscale(
-                popup["glow"], (scaled_glow_width, scaled_glow_height)
+            # Scale is quantized so the scaled surfaces can be reused across frames
+            scaled_surface, scaled_glow, shadow_surface = popup.get_frame(
+                round(scale / Config.POPUP_SCALE_STEP)
             )
 
             # Apply alpha
@@ -91,21 +155,22 @@ class PopupManager:
             scaled_glow.set_alpha(int(alpha * 0.7))  # Glow is a bit more transparent
 
             # Recalculate position to keep it centered
-            pos_x = popup["position"][0] - scaled_surface.get_width() // 2
-            pos_y = popup["position"][1] - scaled_surface.get_height() // 2
+            pos_x = popup.position[0] - scaled_surface.get_width() // 2
+            pos_y = popup.position[1] - scaled_surface.get_height() // 2
 
-            glow_pos_x = popup["position"][0] - scaled_glow.get_width() // 2
-            glow_pos_y = popup["position"][1] - scaled_glow.get_height() // 2
+            glow_pos_x = popup.position[0] - scaled_glow.get_width() // 2
+            glow_pos_y = popup.position[1] - scaled_glow.get_height() // 2
 
             # Simple shadow effect (multiple darker blits offset)
             shadow_alpha = int(alpha * 0.3)
             if shadow_alpha > 0:
-                shadow_surface = scaled_surface.copy()
-                shadow_surface.fill(
-                    (0, 0, 0, shadow_alpha), special_flags=pygame.BLEND_RGBA_MULT
-                )
+                shadow_surface.set_alpha(shadow_alpha)
                 for offset in [(2, 2), (3, 3), (4, 4)]:  # Multiple shadow layers
                     surface.blit(shadow_surface, (pos_x + offset[0], pos_y + offset[1]))
 
-            surface.blit(scaled_glow, (glow_pos_x, glow_pos_y))
-            surface.blit(scaled_surface, (pos_x, pos_y))
+            glow_rect = surface.blit(scaled_glow, (glow_pos_x, glow_pos_y))
+            label_rect = surface.blit(scaled_surface, (pos_x, pos_y))
+            # Shadow extends the label area by the largest offset
+            self.renderer.mark_dirty(
+                glow_rect.union(label_rect.inflate(4, 4).move(2, 2))
+            )
@@ -0,0 +1,132 @@
+import csv
+import os
+import time
+from array import array
+from time import perf_counter_ns
+from .config import Config
+
+# Per-frame phase timings for the in-game profiler overlay (F3) and its CSV dump
+# (F4). One fixed-size ring buffer of nanoseconds per phase, all written at the same
+# slot each frame so a row across the buffers is one frame.
+
+PHASES = (
+    "input",
+    "update",
+    "lock_clear",
+    "draw_main",
+    "draw_popups",
+    "display_update",
+)
+FRAME = "frame"  # Whole frame from begin_frame to end_frame
+
+
+# --- Frame Profiler ---
+class FrameProfiler:
+    def __init__(self, size=None):
+        self.size = Config.PROFILER_BUFFER_SIZE if size is None else size
+        self.buffers = {
+            name: array("q", bytes(8 * self.size)) for name in PHASES + (FRAME,)
+        }
+        self.count = 0  # Valid frames in the buffers, up to size
+        self.frame_count = 0  # Frames recorded since start
+        self._head = 0
+        self._current = dict.fromkeys(PHASES, 0)
+        self._frame_start = None
+        self._last_mark = None
+
+    def begin_frame(self):
+        self._current = dict.fromkeys(PHASES, 0)
+        self._frame_start = self._last_mark = perf_counter_ns()
+
+    # Throws away the frame so far (e.g. time spent in the pause menu) and restarts it
+    discard_frame = begin_frame
+
+    def mark(self, phase, nested_phase=None, nested_ns=0):
+        # Charges the time since the previous mark to phase, minus nested_ns that
+        # were spent in nested_phase inside it (lock/clear inside engine steps)
+        if self._last_mark is None:
+            return
+        now = perf_counter_ns()
+        self._current[phase] += now - self._last_mark - nested_ns
+        if nested_phase is not None:
+            self._current[nested_phase] += nested_ns
+        self._last_mark = now
+
+    def skip(self):
+        # Time since the previous mark belongs to no phase (e.g. the overlay itself)
+        if self._last_mark is not None:
+            self._last_mark = perf_counter_ns()
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        head = self._head
+        for name, value in self._current.items():
+            self.buffers[name][head] = value
+        self.buffers[FRAME][head] = perf_counter_ns() - self._frame_start
+        self._head = (head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        self.frame_count += 1
+        self._frame_start = self._last_mark = None
+
+    # --- Reports ---
+    def values(self, name):
+        # Valid samples of one buffer, oldest first
+        buffer, head = self.buffers[name], self._head
+        if self.count < self.size:
+            return buffer[: self.count]
+        return buffer[head:] + buffer[:head]
+
+    def stats(self, name):
+        # (p50, p99, max) in nanoseconds, zeros before the first frame
+        values = sorted(self.values(name))
+        if not values:
+            return 0, 0, 0
+        last = len(values) - 1
+        return values[last // 2], values[last * 99 // 100], values[last]
+
+    def dump_csv(self, path=None):
+        if path is None:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(Config.PROFILER_DIR, f"frames-{stamp}.csv")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        names = (FRAME,) + PHASES
+        columns = [self.values(name) for name in names]
+        first_frame = self.frame_count - self.count
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + [f"{name}_ms" for name in names])
+            for i, row in enumerate(zip(*columns)):
+                writer.writerow(
+                    [first_frame + i] + [f"{value / 1e6:.4f}" for value in row]
+                )
+        return path
+
+
+# --- Startup Profiler ---
+class StartupProfiler:
+    # Wall-clock breakdown of startup for --profile-startup: each mark(name) closes
+    # a phase that began at the previous mark, the first one at started_ns
+    def __init__(self, started_ns=None):
+        self.started_ns = perf_counter_ns() if started_ns is None else started_ns
+        self.phases = []  # (name, ns)
+        self._last_mark = self.started_ns
+
+    def mark(self, name):
+        now = perf_counter_ns()
+        self.phases.append((name, now - self._last_mark))
+        self._last_mark = now
+
+    @property
+    def total_ns(self):
+        return self._last_mark - self.started_ns
+
+    def report(self):
+        lines = [f"{'Startup phase':<24}{'ms':>9}{'total ms':>10}"]
+        total = 0
+        for name, ns in self.phases:
+            total += ns
+            lines.append(f"{name:<24}{ns / 1e6:>9.1f}{total / 1e6:>10.1f}")
+        return lines
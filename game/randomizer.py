@@ -0,0 +1,94 @@
+import random
+from .config import Config
+from .shapes import SHAPE_COUNT
+
+# Piece randomizers produce shape ids; PieceQueue buffers the next N of them so the
+# front end can preview them and bots can look ahead without touching the RNG.
+
+
+# --- Randomizers ---
+class PureRandomizer:
+    # Independent uniform draws (the original behaviour), unbounded droughts
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+
+    def next_shape(self):
+        return self.rng.randrange(SHAPE_COUNT)
+
+
+class BagRandomizer:
+    # 7-bag: every shape once per shuffled bag, so droughts are at most 12 pieces
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+        self.bag = []
+
+    def next_shape(self):
+        if not self.bag:
+            self.bag = list(range(SHAPE_COUNT))
+            self.rng.shuffle(self.bag)
+        return self.bag.pop()
+
+
+class HistoryRandomizer:
+    # Rerolls a few times when the draw is in the recent-shape history (TGM style)
+    def __init__(self, rng=None, history_size=4, rolls=4):
+        self.rng = rng or random.Random()
+        self.rolls = rolls
+        self.history = [-1] * history_size
+
+    def next_shape(self):
+        shape_id = self.rng.randrange(SHAPE_COUNT)
+        for _ in range(self.rolls - 1):
+            if shape_id not in self.history:
+                break
+            shape_id = self.rng.randrange(SHAPE_COUNT)
+        self.history.pop(0)
+        self.history.append(shape_id)
+        return shape_id
+
+
+RANDOMIZERS = {
+    "random": PureRandomizer,
+    "bag": BagRandomizer,
+    "history": HistoryRandomizer,
+}
+
+
+def create_randomizer(mode=None, rng=None):
+    mode = Config.RANDOMIZER if mode is None else mode
+    if mode not in RANDOMIZERS:
+        raise ValueError(
+            f"Unknown randomizer {mode!r}, expected one of {list(RANDOMIZERS)}"
+        )
+    return RANDOMIZERS[mode](rng)
+
+
+# --- Piece Queue ---
+# Fixed-size ring buffer of upcoming shape ids, kept full: every pop refills the
+# freed slot from the randomizer.
+class PieceQueue:
+    __slots__ = ("randomizer", "capacity", "_items", "_head")
+
+    def __init__(self, randomizer, capacity=None):
+        self.randomizer = randomizer
+        self.capacity = max(1, Config.PREVIEW_COUNT if capacity is None else capacity)
+        self._items = [randomizer.next_shape() for _ in range(self.capacity)]
+        self._head = 0
+
+    def __len__(self):
+        return self.capacity
+
+    def peek(self, index=0):
+        return self._items[(self._head + index) % self.capacity]
+
+    def pop(self):
+        head = self._head
+        shape_id = self._items[head]
+        self._items[head] = self.randomizer.next_shape()
+        self._head = (head + 1) % self.capacity
+        return shape_id
+
+    def preview(self, count=None):
+        count = self.capacity if count is None else min(count, self.capacity)
+        items, head, capacity = self._items, self._head, self.capacity
+        return tuple(items[(head + i) % capacity] for i in range(count))
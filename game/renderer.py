@@ -1,5 +1,8 @@
 import pygame
 from .config import Config
+from .shapes import SHAPE_BOUNDS, SHAPE_CELLS, SHAPE_COLORS, SHAPE_MATRIX_CELLS
+from .display import DirtyRectTracker
+from .profiler import FRAME, PHASES
 
 # Piece, GameLogic, AssetManager are passed as arguments or in constructor
 
@@ -10,6 +13,19 @@ class Renderer:
         self.surface = surface
         self.assets = asset_manager  # AssetManager instance
 
+        # Pre-rendered static playfield layers, rebuilt when the layout changes
+        self._static_key = None
+        self._background_layer = None  # Black fill + title, blitted first
+        self._overlay_layer = None  # Grid lines + border, blitted over the blocks
+
+        # Dirty-rect display updates shared by every scene drawing through this renderer
+        self.display = DirtyRectTracker(surface)
+        self._region_state = {}  # slot -> (state, rect) of what was drawn last
+
+        # Frame profiler overlay, rebuilt every PROFILER_REFRESH_FRAMES frames
+        self._profiler_surface = None
+        self._profiler_frame = None
+
     def draw_text(
         self,
         text,
@@ -22,41 +38,132 @@ class Renderer:
         center_y=False,
         bold=False,
     ):
-        font = self.assets.get_font(font_name, size, bold=bold)
-        label = font.render(text, 1, color)
+        label = self.assets.render_text(text, size, color, font_name, bold)
         text_width, text_height = label.get_size()
         if center_x:
             x -= text_width // 2
         if center_y:
             y -= text_height // 2
-        self.surface.blit(label, (x, y))
+        return self.surface.blit(label, (x, y))
 
     def draw_text_middle(
         self, text, size, color, font_name="comicsans", bold=True, y_offset=0
     ):
         x = Config.TOP_LEFT_X + Config.PLAY_WIDTH / 2
         y = Config.TOP_LEFT_Y + Config.PLAY_HEIGHT / 2 + y_offset
-        self.draw_text(
+        return self.draw_text(
             text, size, color, x, y, font_name, center_x=True, center_y=True, bold=bold
         )
 
-    def draw_grid_lines(self):
-        sx, sy = Config.TOP_LEFT_X, Config.TOP_LEFT_Y
+    # --- Dirty rect helpers ---
+    def mark_dirty(self, rect):
+        self.display.add(rect)
+
+    def mark_full_redraw(self):
+        self.display.mark_full()
+
+    def track_region(self, slot, state, rect):
+        # Marks rect dirty, along with the rect drawn for this slot last time, but only
+        # when the slot's state changed since then
+        last = self._region_state.get(slot)
+        if last is None or last[0] != state:
+            if last is not None:
+                self.display.add(last[1])
+            self.display.add(rect)
+        self._region_state[slot] = (state, rect)
+
+    def present(self, scene=None):
+        # Replaces pygame.display.update(); a change of scene forces a full flip
+        self.display.flush(scene)
+
+    def draw_grid_lines(self, surface=None, sx=None, sy=None):
+        surface = self.surface if surface is None else surface
+        sx = Config.TOP_LEFT_X if sx is None else sx
+        sy = Config.TOP_LEFT_Y if sy is None else sy
         for i in range(Config.GRID_ROWS + 1):
             pygame.draw.line(
-                self.surface,
+                surface,
                 (128, 128, 128),
                 (sx, sy + i * Config.BLOCK_SIZE),
                 (sx + Config.PLAY_WIDTH, sy + i * Config.BLOCK_SIZE),
             )
         for j in range(Config.GRID_COLS + 1):
             pygame.draw.line(
-                self.surface,
+                surface,
                 (128, 128, 128),
                 (sx + j * Config.BLOCK_SIZE, sy),
                 (sx + j * Config.BLOCK_SIZE, sy + Config.PLAY_HEIGHT),
             )
 
+    def _layout_key(self):
+        return (
+            self.surface.get_size(),
+            Config.S_WIDTH,
+            Config.S_HEIGHT,
+            Config.PLAY_WIDTH,
+            Config.PLAY_HEIGHT,
+            Config.BLOCK_SIZE,
+            Config.TOP_LEFT_X,
+            Config.TOP_LEFT_Y,
+            Config.GRID_ROWS,
+            Config.GRID_COLS,
+        )
+
+    def _build_static_layers(self):
+        background = pygame.Surface(self.surface.get_size()).convert()
+        background.fill((0, 0, 0))
+        title = self.assets.render_text("TETRIS", 60, (255, 255, 255))
+        background.blit(title, (Config.S_WIDTH / 2 - title.get_width() // 2, 30))
+
+        # Overlay covers the playfield plus the closing grid line, everything
+        # else is colorkeyed out so the blocks underneath show through
+        overlay_key = (255, 0, 255)
+        overlay = pygame.Surface((Config.PLAY_WIDTH + 1, Config.PLAY_HEIGHT + 1))
+        overlay = overlay.convert()
+        overlay.fill(overlay_key)
+        overlay.set_colorkey(overlay_key, pygame.RLEACCEL)
+        self.draw_grid_lines(overlay, 0, 0)
+        pygame.draw.rect(
+            overlay,
+            (255, 0, 0),  # Border color
+            (0, 0, Config.PLAY_WIDTH, Config.PLAY_HEIGHT),
+            5,  # Border thickness
+        )
+
+        self._background_layer = background
+        self._overlay_layer = overlay
+
+    def _ensure_static_layers(self):
+        key = self._layout_key()
+        if key != self._static_key:
+            self._build_static_layers()
+            self._static_key = key
+            self.mark_full_redraw()
+
+    def _mark_dirty_rows(self, rows):
+        # One rect per run of consecutive dirty rows (grid lines included)
+        start = previous = None
+        for r in sorted(rows):
+            if start is None:
+                start = previous = r
+            elif r == previous + 1:
+                previous = r
+            else:
+                self._mark_row_span(start, previous)
+                start = previous = r
+        if start is not None:
+            self._mark_row_span(start, previous)
+
+    def _mark_row_span(self, first_row, last_row):
+        self.mark_dirty(
+            (
+                Config.TOP_LEFT_X,
+                Config.TOP_LEFT_Y + first_row * Config.BLOCK_SIZE,
+                Config.PLAY_WIDTH + 1,
+                (last_row - first_row + 1) * Config.BLOCK_SIZE + 1,
+            )
+        )
+
     def draw_playfield_blocks(self, grid_data):
         for r, row_data in enumerate(grid_data):
             for c, color in enumerate(row_data):
@@ -74,36 +181,42 @@ class Renderer:
                     )
 
     def draw_piece(
-        self, piece, game_logic
+        self, piece, game_logic, y_offset=0
     ):  # piece is a Piece instance, game_logic is a GameLogic instance
+        # y_offset: extra pixels down, for drawing between gravity rows
         if not piece:
-            return
+            return None
         shape_pos = game_logic.convert_shape_format(piece)
+        drawn_rect = None
         for x, y in shape_pos:
             if (
                 y > -1
             ):  # Only draw parts of the piece that are at or below the top edge of the grid (y=0)
-                pygame.draw.rect(
+                block_rect = pygame.draw.rect(
                     self.surface,
                     piece.color,
                     (
                         Config.TOP_LEFT_X + x * Config.BLOCK_SIZE,
-                        Config.TOP_LEFT_Y + y * Config.BLOCK_SIZE,
+                        Config.TOP_LEFT_Y + y * Config.BLOCK_SIZE + y_offset,
                         Config.BLOCK_SIZE,
                         Config.BLOCK_SIZE,
                     ),
                     0,
                 )
+                drawn_rect = (
+                    block_rect if drawn_rect is None else drawn_rect.union(block_rect)
+                )
+        return drawn_rect  # Area covered by the piece, for dirty-rect tracking
 
     def _draw_side_panel_piece(
         self, piece, title, base_sx, base_sy
     ):  # piece is a Piece instance
         if not piece:
-            return
-        self.draw_text(
+            return None
+        title_rect = self.draw_text(
             title, 30, (255, 255, 255), base_sx + 60, base_sy, center_x=True
         )  # Centered title
-        shape_matrix = piece.get_current_shape_matrix()
+        matrix_cells = SHAPE_MATRIX_CELLS[piece.shape_id][piece.rotation_index]
 
         # Calculate offsets to center the 5x5 matrix in the designated area
         matrix_pixel_width = 5 * Config.BLOCK_SIZE
@@ -117,58 +230,190 @@ class Renderer:
             0  # (120 - matrix_pixel_height) // 2 # Example: if panel area is 120px high
         )
 
-        for i, line in enumerate(shape_matrix):
-            for j, column_char in enumerate(list(line)):
-                if column_char == "0":
-                    pygame.draw.rect(
-                        self.surface,
-                        piece.color,
-                        (
-                            base_sx + offset_x + j * Config.BLOCK_SIZE,
-                            base_sy + offset_y + i * Config.BLOCK_SIZE + 50,
-                            Config.BLOCK_SIZE,
-                            Config.BLOCK_SIZE,
-                        ),
-                        0,
-                    )
+        for j, i in matrix_cells:
+            pygame.draw.rect(
+                self.surface,
+                piece.color,
+                (
+                    base_sx + offset_x + j * Config.BLOCK_SIZE,
+                    base_sy + offset_y + i * Config.BLOCK_SIZE + 50,
+                    Config.BLOCK_SIZE,
+                    Config.BLOCK_SIZE,
+                ),
+                0,
+            )
+        # Whole panel area (title + 5x5 matrix), for dirty-rect tracking
+        return title_rect.union(
+            pygame.Rect(
+                base_sx + offset_x,
+                base_sy + offset_y + 50,
+                matrix_pixel_width,
+                matrix_pixel_height,
+            )
+        )
 
     def draw_next_shape(self, piece):  # piece is a Piece instance
         sx = Config.TOP_LEFT_X + Config.PLAY_WIDTH + 60
         sy = Config.TOP_LEFT_Y + Config.PLAY_HEIGHT / 2 - 200  # Adjusted position
-        self._draw_side_panel_piece(piece, "Next Shape", sx, sy)
+        return self._draw_side_panel_piece(piece, "Next Shape", sx, sy)
 
     def draw_held_shape(self, piece):  # piece is a Piece instance
         sx = Config.TOP_LEFT_X + Config.PLAY_WIDTH + 25  # Adjusted for centering
         sy = Config.TOP_LEFT_Y + Config.PLAY_HEIGHT / 2 + 50 + 30  # Adjusted position
-        self._draw_side_panel_piece(piece, "Held", sx, sy)
+        return self._draw_side_panel_piece(piece, "Held", sx, sy)
+
+    def draw_piece_queue(self, shape_ids):
+        # Pieces after "Next Shape", stacked at half block size in the left panel
+        if not shape_ids:
+            return None
+        block = Config.BLOCK_SIZE // 2
+        slot_height = 5 * block
+        center_x = Config.TOP_LEFT_X // 2
+        sy = Config.TOP_LEFT_Y + Config.PLAY_HEIGHT / 2 - 200
+        title_rect = self.draw_text(
+            "Queue", 30, (255, 255, 255), center_x, sy, center_x=True
+        )
+        top = sy + 50
+        for slot, shape_id in enumerate(shape_ids):
+            min_dx, min_dy, max_dx, max_dy = SHAPE_BOUNDS[shape_id][0]
+            offset_x = center_x - (max_dx - min_dx + 1) * block // 2
+            offset_y = top + slot * slot_height
+            for dx, dy in SHAPE_CELLS[shape_id][0]:
+                pygame.draw.rect(
+                    self.surface,
+                    SHAPE_COLORS[shape_id],
+                    (
+                        offset_x + (dx - min_dx) * block,
+                        offset_y + (dy - min_dy) * block,
+                        block,
+                        block,
+                    ),
+                    0,
+                )
+        return title_rect.union(
+            pygame.Rect(
+                center_x - 2 * block, top, 4 * block, len(shape_ids) * slot_height
+            )
+        )
+
+    def draw_autoplay_label(self, active):
+        # Left panel marker while the bot is playing
+        rect = None
+        if active:
+            rect = self.draw_text(
+                "AUTOPLAY",
+                30,
+                (255, 215, 0),
+                Config.TOP_LEFT_X // 2,
+                Config.TOP_LEFT_Y + 30,
+                center_x=True,
+            )
+        self.track_region("autoplay", active, rect)
+        return rect
+
+    def draw_profiler_overlay(self, profiler):
+        # Frame-time graph and per-phase p50/p99/max; profiler=None hides it
+        rect = None
+        if profiler is not None:
+            if (
+                self._profiler_surface is None
+                or profiler.frame_count - self._profiler_frame
+                >= Config.PROFILER_REFRESH_FRAMES
+            ):
+                self._profiler_surface = self._build_profiler_surface(profiler)
+                self._profiler_frame = profiler.frame_count
+            rect = self.surface.blit(self._profiler_surface, (5, 5))
+        else:
+            self._profiler_surface = self._profiler_frame = None
+        self.track_region("profiler", self._profiler_frame, rect)
+        return rect
+
+    def _build_profiler_surface(self, profiler):
+        width, graph_height, line_height = 240, 60, 14
+        names = (FRAME,) + PHASES
+        panel = pygame.Surface(
+            (width, graph_height + 15 + line_height * (len(names) + 1)),
+            pygame.SRCALPHA,
+        )
+        panel.fill((0, 0, 0, 190))
+
+        # One bar per recent frame, full height = two 60 FPS frame budgets
+        budget_ns = 1e9 / 60
+        scale = graph_height / (2 * budget_ns)
+        frames = profiler.values(FRAME)[-(width - 10) :]
+        for i, value in enumerate(frames):
+            bar = min(graph_height, max(1, int(value * scale)))
+            color = (
+                (0, 200, 0)
+                if value <= budget_ns
+                else (230, 200, 0) if value <= 2 * budget_ns else (230, 40, 40)
+            )
+            pygame.draw.line(
+                panel, color, (5 + i, 5 + graph_height), (5 + i, 5 + graph_height - bar)
+            )
+        budget_y = 5 + graph_height - int(budget_ns * scale)
+        pygame.draw.line(panel, (128, 128, 128), (5, budget_y), (width - 5, budget_y))
+
+        # Columns are right-aligned individually, the font may not be monospaced
+        font = self.assets.get_font("couriernew", 14, bold=True)
+        columns = (140, 185, 230)  # Right edges of p50, p99, max
+        y = graph_height + 12
+        rows = [("ms", ("p50", "p99", "max"), (255, 215, 0))]
+        for name in names:
+            stats = (f"{value / 1e6:.2f}" for value in profiler.stats(name))
+            rows.append((name, tuple(stats), (255, 255, 255)))
+        for label, cells, color in rows:
+            panel.blit(font.render(label, True, color), (5, y))
+            for right, text in zip(columns, cells):
+                text_surface = font.render(text, True, color)
+                panel.blit(text_surface, (right - text_surface.get_width(), y))
+            y += line_height
+        return panel
 
     def draw_score(self, score):
         sx = Config.TOP_LEFT_X + Config.PLAY_WIDTH + 125  # Right panel
         sy = Config.TOP_LEFT_Y + 30
-        self.draw_text(f"Score: {score}", 30, (255, 255, 255), sx, sy, center_x=True)
+        return self.draw_text(
+            f"Score: {score}", 30, (255, 255, 255), sx, sy, center_x=True
+        )
 
     def draw_main_tetris_window(
-        self, grid_data, score, current_piece, next_piece, held_piece, game_logic
+        self,
+        grid_data,
+        score,
+        current_piece,
+        next_piece,
+        held_piece,
+        game_logic,
+        upcoming=(),
+        piece_offset=0,
     ):  # current_piece, next_piece, held_piece are Piece instances, game_logic is a GameLogic instance
-        self.surface.fill((0, 0, 0))
-        self.draw_text(
-            "TETRIS", 60, (255, 255, 255), Config.S_WIDTH / 2, 30, center_x=True
-        )
-        self.draw_score(score)
+        # upcoming: shape ids queued after next_piece, shown in the left panel
+        # piece_offset: pixels the current piece has fallen towards its next row
+        # Static parts (fill, title, grid lines, border) come from cached layers,
+        # only the dynamic layers are drawn every frame
+        self._ensure_static_layers()
+        self.surface.blit(self._background_layer, (0, 0))
+        self.track_region("score", score, self.draw_score(score))
         self.draw_playfield_blocks(grid_data)
+        self._mark_dirty_rows(game_logic.take_dirty_rows())
+        piece_rect = None
         if current_piece:
-            self.draw_piece(current_piece, game_logic)
-        self.draw_grid_lines()
-        pygame.draw.rect(
-            self.surface,
-            (255, 0, 0),  # Border color
-            (
-                Config.TOP_LEFT_X,
-                Config.TOP_LEFT_Y,
-                Config.PLAY_WIDTH,
-                Config.PLAY_HEIGHT,
-            ),
-            5,  # Border thickness
+            piece_rect = self.draw_piece(current_piece, game_logic, piece_offset)
+        self.track_region(
+            "piece", (self._piece_state(current_piece), piece_offset), piece_rect
         )
-        self.draw_next_shape(next_piece)
-        self.draw_held_shape(held_piece)
+        self.surface.blit(self._overlay_layer, (Config.TOP_LEFT_X, Config.TOP_LEFT_Y))
+        self.track_region(
+            "next", self._piece_state(next_piece), self.draw_next_shape(next_piece)
+        )
+        self.track_region(
+            "held", self._piece_state(held_piece), self.draw_held_shape(held_piece)
+        )
+        upcoming = tuple(upcoming)
+        self.track_region("queue", upcoming, self.draw_piece_queue(upcoming))
+
+    def _piece_state(self, piece):
+        if not piece:
+            return None
+        return (piece.shape_id, piece.rotation_index, piece.x, piece.y)
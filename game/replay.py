@@ -0,0 +1,238 @@
+import argparse
+import os
+import struct
+import time
+from .config import Config
+from .engine import ACTIONS, TetrisEngine
+
+# Deterministic game replays: the engine seed plus every step() the front end made,
+# as fixed 3-byte records (action code, dt_ms). Re-running the records through a
+# TetrisEngine with the same seed reproduces the game exactly, so playback can be
+# rendered at 1x or simulated headless as fast as Python allows.
+# Run with: python -m game.replay replays/<file>.tetr
+
+MAGIC = b"TRPL"
+VERSION = 3  # 3: engine gravity carries leftover time across steps
+
+# magic, version, seed, randomizer, preview count, records, then the final result
+# (score, lines, pieces locked, engine ms) used to verify playback and the wall-clock
+# survival time minus pauses, as TetrisGame shows it
+HEADER = struct.Struct("<4sHQ8sBIIIIII")
+RECORD = struct.Struct("<BH")  # action code, dt_ms
+
+TICK = 0  # step(None, dt_ms): one logic tick of gravity
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS, 1)}
+CODE_ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+PAUSE = len(ACTIONS) + 1  # Pause menu, dt_ms is the paused time (no engine step)
+MAX_DT = 0xFFFF
+
+
+class ReplayError(ValueError):
+    pass
+
+
+# --- Replay ---
+class Replay:
+    def __init__(
+        self,
+        seed,
+        randomizer=None,
+        preview_count=None,
+        records=b"",
+        score=0,
+        lines=0,
+        pieces=0,
+        elapsed_ms=0,
+        survival_ms=0,
+    ):
+        self.seed = seed
+        self.randomizer = Config.RANDOMIZER if randomizer is None else randomizer
+        self.preview_count = (
+            Config.PREVIEW_COUNT if preview_count is None else preview_count
+        )
+        self.records = bytearray(records)
+        # Result of the recorded game, filled in by ReplayRecorder.finish
+        self.score = score
+        self.lines = lines
+        self.pieces = pieces
+        self.elapsed_ms = elapsed_ms
+        self.survival_ms = survival_ms
+
+    def __len__(self):
+        return len(self.records) // RECORD.size
+
+    def __iter__(self):
+        # Yields (code, dt_ms); see TICK, ACTION_CODES and PAUSE
+        return RECORD.iter_unpack(self.records)
+
+    @property
+    def paused_ms(self):
+        return sum(dt for code, dt in self if code == PAUSE)
+
+    def new_engine(self):
+        return TetrisEngine(self.seed, None, self.randomizer, self.preview_count)
+
+    # --- Serialization ---
+    def to_bytes(self):
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            self.seed,
+            self.randomizer.encode("ascii"),
+            self.preview_count,
+            len(self),
+            self.score,
+            self.lines,
+            self.pieces,
+            self.elapsed_ms,
+            self.survival_ms,
+        )
+        return header + self.records
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ReplayError("Replay is truncated")
+        (
+            magic,
+            version,
+            seed,
+            randomizer,
+            preview_count,
+            count,
+            score,
+            lines,
+            pieces,
+            elapsed_ms,
+            survival_ms,
+        ) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ReplayError("Not a replay file (or an unsupported version)")
+        end = HEADER.size + count * RECORD.size
+        if len(data) < end:
+            raise ReplayError("Replay is truncated")
+        return cls(
+            seed,
+            randomizer.rstrip(b"\0").decode("ascii"),
+            preview_count,
+            data[HEADER.size : end],
+            score,
+            lines,
+            pieces,
+            elapsed_ms,
+            survival_ms,
+        )
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+# --- Recording ---
+class ReplayRecorder:
+    # Mirrors every engine.step() call of one game into a Replay
+    def __init__(self, engine):
+        self.replay = Replay(engine.seed, engine.randomizer_mode, engine.preview_count)
+        self._pack = RECORD.pack
+
+    def record(self, action, dt_ms):
+        # Returns the (action, dt_ms) engine steps that were recorded, which the
+        # caller must apply: a dt over MAX_DT is split, the action taking the first
+        # MAX_DT and plain TICKs the rest, and one long step isn't the same game
+        dt_ms = int(dt_ms)
+        steps = [(action, min(dt_ms, MAX_DT))]
+        dt_ms -= MAX_DT
+        while dt_ms > 0:
+            steps.append((None, min(dt_ms, MAX_DT)))
+            dt_ms -= MAX_DT
+        pack = self._pack
+        for step_action, step_ms in steps:
+            code = TICK if step_action is None else ACTION_CODES[step_action]
+            self.replay.records += pack(code, step_ms)
+        return steps
+
+    def record_pause(self, paused_ms):
+        paused_ms = int(paused_ms)
+        while True:  # Long pauses are split, they never reach the engine
+            self.replay.records += self._pack(PAUSE, min(paused_ms, MAX_DT))
+            paused_ms -= MAX_DT
+            if paused_ms <= 0:
+                break
+
+    def finish(self, engine, survival_ms=0):
+        replay = self.replay
+        replay.survival_ms = int(survival_ms)
+        replay.score = engine.score
+        replay.lines = engine.total_lines_cleared
+        replay.pieces = engine.pieces_locked
+        replay.elapsed_ms = engine.elapsed_ms
+        return replay
+
+
+def replay_path(replay, directory=None):
+    directory = Config.REPLAY_DIR if directory is None else directory
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, f"{stamp}-{replay.seed:016x}.tetr")
+
+
+# --- Playback ---
+def simulate(replay, engine=None):
+    # Headless max-speed playback, returns the engine in its final state
+    engine = replay.new_engine() if engine is None else engine
+    step = engine.step
+    for code, dt_ms in replay:
+        if code == TICK:
+            step(None, dt_ms)
+        elif code != PAUSE:
+            step(CODE_ACTIONS[code], dt_ms)
+    return engine
+
+
+def verify(replay, engine):
+    # True when a playback ended where the recorded game did
+    return (
+        engine.score,
+        engine.total_lines_cleared,
+        engine.pieces_locked,
+        engine.elapsed_ms,
+    ) == (replay.score, replay.lines, replay.pieces, replay.elapsed_ms)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Tetris replay playback")
+    parser.add_argument("paths", nargs="+", help="Replay files")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path in args.paths:
+        try:
+            replay = Replay.load(path)
+        except (OSError, ReplayError) as e:
+            print(f"{path}: unreadable ({e})")
+            failed += 1
+            continue
+        started = time.perf_counter()
+        engine = simulate(replay)
+        elapsed = time.perf_counter() - started
+        ok = verify(replay, engine)
+        failed += not ok
+        print(
+            f"{path}: score {engine.score}, lines {engine.total_lines_cleared}, "
+            f"pieces {engine.pieces_locked}, {engine.elapsed_ms / 1000:.1f}s game time, "
+            f"{len(replay)} steps in {elapsed * 1000:.1f}ms "
+            f"({'ok' if ok else 'DESYNC'})"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,339 @@
+import argparse
+import os
+import struct
+import time
+import numpy as np
+from .config import Config
+from .parallel import parallel_map
+from .replay import CODE_ACTIONS, PAUSE, Replay
+
+# Replay corpus for mining many recorded games: a directory of three append-only,
+# fixed-record files that NumPy memory-maps directly.
+#   index.bin   one INDEX_DTYPE row per game, with offsets into the other two files
+#   inputs.bin  the games' replay records back to back (INPUT_DTYPE = replay.RECORD)
+#   locks.bin   one LOCK_DTYPE row per locked piece, found by re-simulating each game
+#               once when it is added, so the stats never have to replay anything
+# Run with: python -m game.replay_corpus add corpus replays/*.tetr
+#           python -m game.replay_corpus stats corpus
+
+FILE_HEADER = struct.Struct("<4sHH8x")  # magic, version, record size
+VERSION = 1
+
+INDEX_DTYPE = np.dtype(
+    [
+        ("input_offset", "<u8"),  # In records, not bytes
+        ("input_count", "<u4"),
+        ("lock_offset", "<u8"),
+        ("lock_count", "<u4"),
+        ("seed", "<u8"),
+        ("randomizer", "S8"),
+        ("preview_count", "u1"),
+        ("score", "<u4"),
+        ("lines", "<u4"),
+        ("pieces", "<u4"),
+        ("elapsed_ms", "<u4"),
+        ("survival_ms", "<u4"),
+    ]
+)
+INPUT_DTYPE = np.dtype([("code", "u1"), ("dt_ms", "<u2")])
+LOCK_DTYPE = np.dtype(
+    [
+        ("game", "<u4"),
+        ("shape", "u1"),
+        ("level", "<u2"),  # Level the piece was locked at, before its clears count
+        ("lines", "u1"),
+        ("cells", "i1", (4, 2)),  # (x, y) grid cells, y < 0 is above the board
+    ]
+)
+
+FILES = {
+    "index": ("index.bin", b"TRCI", INDEX_DTYPE),
+    "inputs": ("inputs.bin", b"TRCR", INPUT_DTYPE),
+    "locks": ("locks.bin", b"TRCL", LOCK_DTYPE),
+}
+
+
+class CorpusError(ValueError):
+    pass
+
+
+# --- Ingest ---
+def _ingest(path):
+    # Loads and re-simulates one replay; runs in worker processes
+    replay = Replay.load(path)
+    engine = replay.new_engine()
+    locks = []
+    step = engine.step
+    cells_of = engine.game_logic.convert_shape_format
+    for code, dt_ms in replay:
+        if code == PAUSE:
+            continue
+        level = engine.level
+        for name, value in step(CODE_ACTIONS.get(code), dt_ms):
+            if name == "lock":
+                piece = engine.last_locked_piece
+                locks.append((0, piece.shape_id, level, value, tuple(cells_of(piece))))
+    row = (
+        0,
+        len(replay),
+        0,
+        len(locks),
+        replay.seed,
+        replay.randomizer.encode("ascii"),
+        replay.preview_count,
+        replay.score,
+        replay.lines,
+        replay.pieces,
+        replay.elapsed_ms,
+        replay.survival_ms,
+    )
+    return bytes(replay.records), np.array(locks, dtype=LOCK_DTYPE), row
+
+
+# --- Corpus ---
+class ReplayCorpus:
+    def __init__(self, path):
+        self.path = path
+
+    def _file(self, name):
+        return os.path.join(self.path, FILES[name][0])
+
+    def _map(self, name):
+        # Read-only memory map of one table (an empty array for an empty table)
+        filename, magic, dtype = FILES[name]
+        path = self._file(name)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=dtype)
+        with open(path, "rb") as f:
+            header = f.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size or FILE_HEADER.unpack(header) != (
+            magic,
+            VERSION,
+            dtype.itemsize,
+        ):
+            raise CorpusError(f"{path} is not a version {VERSION} corpus file")
+        count = (os.path.getsize(path) - FILE_HEADER.size) // dtype.itemsize
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(
+            path, dtype=dtype, mode="r", offset=FILE_HEADER.size, shape=(count,)
+        )
+
+    @property
+    def index(self):
+        return self._map("index")
+
+    @property
+    def inputs(self):
+        return self._map("inputs")
+
+    @property
+    def locks(self):
+        return self._map("locks")
+
+    def __len__(self):
+        return len(self.index)
+
+    def append(self, paths, workers=None):
+        # Adds replay files. The index is written last, so an interrupted append
+        # only leaves unreferenced tail data, cut off by the next append.
+        os.makedirs(self.path, exist_ok=True)
+        index = self.index
+        game = len(index)
+        input_offset = lock_offset = 0
+        if game:
+            last = index[-1]
+            input_offset = int(last["input_offset"]) + int(last["input_count"])
+            lock_offset = int(last["lock_offset"]) + int(last["lock_count"])
+        del index  # Release the map before the file grows
+
+        # Small chunks, so the games are written out while the rest are ingested
+        results = parallel_map(_ingest, paths, workers, chunksize=16)
+        self._truncate("index", game)
+        self._truncate("inputs", input_offset)
+        self._truncate("locks", lock_offset)
+        files = {name: self._open_append(name) for name in FILES}
+        try:
+            rows = []
+            for records, locks, row in results:
+                files["inputs"].write(records)
+                locks["game"] = game
+                files["locks"].write(locks.tobytes())
+                rows.append((input_offset, row[1], lock_offset) + row[3:])
+                input_offset += row[1]
+                lock_offset += row[3]
+                game += 1
+            files["inputs"].flush()
+            files["locks"].flush()
+            files["index"].write(np.array(rows, dtype=INDEX_DTYPE).tobytes())
+        finally:
+            for f in files.values():
+                f.close()
+            results.close()
+        return len(rows)
+
+    def _open_append(self, name):
+        filename, magic, dtype = FILES[name]
+        path = self._file(name)
+        f = open(path, "ab")
+        if f.tell() == 0:
+            f.write(FILE_HEADER.pack(magic, VERSION, dtype.itemsize))
+        return f
+
+    def _truncate(self, name, count):
+        path = self._file(name)
+        size = FILE_HEADER.size + count * FILES[name][2].itemsize
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            os.truncate(path, size)
+
+    def replay(self, game):
+        # Rebuilds one game as a Replay, e.g. to watch or debug it
+        row = self.index[game]
+        start = int(row["input_offset"])
+        records = self.inputs[start : start + int(row["input_count"])]
+        return Replay(
+            int(row["seed"]),
+            row["randomizer"].decode("ascii"),
+            int(row["preview_count"]),
+            records.tobytes(),
+            int(row["score"]),
+            int(row["lines"]),
+            int(row["pieces"]),
+            int(row["elapsed_ms"]),
+            int(row["survival_ms"]),
+        )
+
+
+# --- Statistics ---
+def _shard_stats(args):
+    # Lock heatmap and line clears by level for games [start, stop); runs in
+    # worker processes, which map the corpus themselves instead of receiving it
+    path, start, stop = args
+    corpus = ReplayCorpus(path)
+    index = corpus.index[start:stop]
+    first, last = index[0], index[-1]
+    lock_start = int(first["lock_offset"])
+    lock_stop = int(last["lock_offset"]) + int(last["lock_count"])
+    locks = corpus.locks[lock_start:lock_stop]
+
+    rows, cols = Config.GRID_ROWS, Config.GRID_COLS
+    x = locks["cells"][:, :, 0].ravel().astype(np.int64)
+    y = locks["cells"][:, :, 1].ravel().astype(np.int64)
+    on_board = (x >= 0) & (x < cols) & (y >= 0) & (y < rows)
+    heatmap = np.bincount(
+        y[on_board] * cols + x[on_board], minlength=rows * cols
+    ).reshape(rows, cols)
+
+    cleared = locks[locks["lines"] > 0]
+    clears = np.zeros((0, 5), dtype=np.int64)
+    if len(cleared):
+        levels = cleared["level"].astype(np.int64)
+        clears = np.bincount(
+            levels * 5 + cleared["lines"], minlength=(levels.max() + 1) * 5
+        ).reshape(-1, 5)
+    return heatmap, clears
+
+
+def analyze(path, workers=None, shard=5_000):
+    corpus = ReplayCorpus(path)
+    index = corpus.index
+    games = len(index)
+    if not games:
+        raise CorpusError(f"{path} has no games")
+
+    jobs = [
+        (path, start, min(start + shard, games)) for start in range(0, games, shard)
+    ]
+    results = list(parallel_map(_shard_stats, jobs, workers))
+
+    heatmap = sum(heat for heat, _ in results)
+    max_levels = max(len(clears) for _, clears in results)
+    line_clears = np.zeros((max_levels, 5), dtype=np.int64)
+    for _, clears in results:
+        line_clears[: len(clears)] += clears
+
+    score = index["score"].astype(np.float64)
+    survival = index["survival_ms"] / 1000.0
+    if games > 1 and score.std() > 0 and survival.std() > 0:
+        correlation = float(np.corrcoef(survival, score)[0, 1])
+        slope = float(np.polyfit(survival, score, 1)[0])
+    else:
+        correlation = slope = float("nan")
+    # Mean score per survival-time decile
+    edges = np.unique(np.percentile(survival, np.linspace(0, 100, 11)))
+    bins = np.clip(np.searchsorted(edges, survival, side="right") - 1, 0, None)
+    bins = np.minimum(bins, max(len(edges) - 2, 0))
+    counts = np.bincount(bins)
+    sums = np.bincount(bins, weights=score)
+    score_by_survival = [
+        (float(edges[b]), float(edges[min(b + 1, len(edges) - 1)]), int(n), s / n)
+        for b, (n, s) in enumerate(zip(counts, sums))
+        if n
+    ]
+
+    return {
+        "games": games,
+        "locks": int(index["lock_count"].sum()),
+        "heatmap": heatmap,
+        "line_clears": line_clears,  # [level, lines] counts, level 0 unused
+        "score_survival_correlation": correlation,
+        "points_per_second": slope,
+        "score_by_survival": score_by_survival,
+    }
+
+
+def format_stats(stats):
+    lines = [f"{stats['games']} games, {stats['locks']} pieces locked", ""]
+
+    heatmap = stats["heatmap"]
+    total = heatmap.sum() or 1
+    lines.append("Lock heatmap (% of locked cells):")
+    for row in heatmap:
+        lines.append(" ".join(f"{100 * cell / total:5.1f}" for cell in row))
+
+    lines.append("")
+    lines.append(f"{'Level':<8}{'Single':>8}{'Double':>8}{'Triple':>8}{'Tetris':>8}")
+    for level, counts in enumerate(stats["line_clears"]):
+        if level and counts.any():
+            lines.append(f"{level:<8}" + "".join(f"{n:>8}" for n in counts[1:]))
+
+    lines.append("")
+    lines.append(
+        f"Score vs survival: r = {stats['score_survival_correlation']:.3f}, "
+        f"{stats['points_per_second']:.1f} points/s"
+    )
+    lines.append(f"{'Survival (s)':<18}{'Games':>8}{'Mean score':>12}")
+    for low, high, count, mean in stats["score_by_survival"]:
+        lines.append(f"{f'{low:.0f}-{high:.0f}':<18}{count:>8}{mean:>12.0f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tetris replay corpus tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Append replay files to a corpus")
+    add.add_argument("corpus")
+    add.add_argument("paths", nargs="+")
+    add.add_argument("--workers", type=int, default=None)
+    stats = commands.add_parser("stats", help="Aggregate statistics over a corpus")
+    stats.add_argument("corpus")
+    stats.add_argument("--workers", type=int, default=None)
+    extract = commands.add_parser("extract", help="Write one game as a replay file")
+    extract.add_argument("corpus")
+    extract.add_argument("game", type=int)
+    extract.add_argument("output")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == "add":
+        added = ReplayCorpus(args.corpus).append(args.paths, args.workers)
+        print(f"Added {added} games to {args.corpus}")
+    elif args.command == "stats":
+        print(format_stats(analyze(args.corpus, args.workers)))
+    else:
+        print(ReplayCorpus(args.corpus).replay(args.game).save(args.output))
+    print(f"({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import random
+from functools import lru_cache
+from .config import Config
+
+
+# --- Alias Sampler ---
+# Walker/Vose alias table: O(n) to build, O(1) per weighted draw (one index and
+# one coin flip), instead of random.choices rebuilding cumulative weights each call.
+class AliasSampler:
+    __slots__ = ("size", "probability", "alias")
+
+    def __init__(self, weights):
+        size = len(weights)
+        total = float(sum(weights))
+        scaled = [w * size / total for w in weights]
+        self.size = size
+        self.probability = [1.0] * size
+        self.alias = list(range(size))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.probability[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1.0 up to float round-off
+        for i in small + large:
+            self.probability[i] = 1.0
+
+    def sample(self, rng=random):
+        i = int(rng.random() * self.size)
+        return i if rng.random() < self.probability[i] else self.alias[i]
+
+    def sample_many(self, count, rng=random):
+        return [self.sample(rng) for _ in range(count)]
+
+
+@lru_cache(maxsize=8)
+def _cached_sampler(weights):
+    return AliasSampler(weights)
+
+
+def symbol_sampler(weights=None):
+    # Shared sampler for the slot symbols, built once per distinct weight list
+    return _cached_sampler(tuple(Config.SLOT_WEIGHTS if weights is None else weights))
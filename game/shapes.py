@@ -0,0 +1,60 @@
+from .config import Config
+
+# Offset between a piece's (x, y) and the top-left of its 5x5 shape matrix
+SHAPE_OFFSET_X = -2
+SHAPE_OFFSET_Y = -4
+
+
+# --- Compiled Shape Tables ---
+# Built once at import from the Config string matrices. Indexed by [shape_id][rotation]:
+#   SHAPE_CELLS     -> tuple of (dx, dy) offsets relative to the piece's (x, y)
+#   SHAPE_MATRIX_CELLS -> tuple of (col, row) inside the 5x5 matrix (side panel drawing)
+#   SHAPE_BOUNDS    -> (min_dx, min_dy, max_dx, max_dy)
+#   SHAPE_ROW_MASKS -> one bitmask per row from min_dy to max_dy, bit 0 = column min_dx
+def _compile_rotation(shape_matrix):
+    matrix_cells = tuple(
+        (j, i)
+        for i, line in enumerate(shape_matrix)
+        for j, column_char in enumerate(line)
+        if column_char == "0"
+    )
+    cells = tuple((j + SHAPE_OFFSET_X, i + SHAPE_OFFSET_Y) for j, i in matrix_cells)
+    min_dx = min(dx for dx, _ in cells)
+    max_dx = max(dx for dx, _ in cells)
+    min_dy = min(dy for _, dy in cells)
+    max_dy = max(dy for _, dy in cells)
+    row_masks = [0] * (max_dy - min_dy + 1)
+    for dx, dy in cells:
+        row_masks[dy - min_dy] |= 1 << (dx - min_dx)
+    return cells, matrix_cells, (min_dx, min_dy, max_dx, max_dy), tuple(row_masks)
+
+
+def _compile_shapes(shapes):
+    cells, matrix_cells, bounds, row_masks = [], [], [], []
+    for shape_format in shapes:
+        compiled = [_compile_rotation(matrix) for matrix in shape_format]
+        cells.append(tuple(c[0] for c in compiled))
+        matrix_cells.append(tuple(c[1] for c in compiled))
+        bounds.append(tuple(c[2] for c in compiled))
+        row_masks.append(tuple(c[3] for c in compiled))
+    return tuple(cells), tuple(matrix_cells), tuple(bounds), tuple(row_masks)
+
+
+SHAPE_CELLS, SHAPE_MATRIX_CELLS, SHAPE_BOUNDS, SHAPE_ROW_MASKS = _compile_shapes(
+    Config.SHAPES
+)
+SHAPE_COUNT = len(SHAPE_CELLS)
+SHAPE_ROTATIONS = tuple(len(rotations) for rotations in SHAPE_CELLS)
+SHAPE_COLORS = tuple(Config.SHAPE_COLORS)
+# Identity lookup so legacy callers passing a Config.*_SHAPE list get its id without a search
+SHAPE_IDS = {id(shape_format): i for i, shape_format in enumerate(Config.SHAPES)}
+
+
+def shape_id_of(shape):
+    # Accepts a shape id or one of the Config.*_SHAPE lists
+    if isinstance(shape, int):
+        return shape
+    shape_id = SHAPE_IDS.get(id(shape))
+    if shape_id is None:
+        shape_id = Config.SHAPES.index(shape)
+    return shape_id
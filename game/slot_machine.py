@@ -1,7 +1,9 @@
 import pygame
 import random
-from collections import Counter
 from .config import Config
+from .paytable import spin_payout, THREE_OF_A_KIND, TWO_OF_A_KIND
+from .sampling import symbol_sampler
+from .timing import ticks_ms
 
 # Renderer and AssetManager are passed in constructor
 
@@ -9,7 +11,7 @@ from .config import Config
 # --- Slot Machine ---
 class SlotMachine:
     def __init__(
-        self, surface, renderer, asset_manager, initial_score
+        self, surface, renderer, asset_manager, initial_score, seed=None
     ):  # renderer is Renderer, asset_manager is AssetManager
         self.surface = surface
         self.renderer = renderer
@@ -20,28 +22,60 @@ class SlotMachine:
             Config.SLOT_VALUES,
             Config.SLOT_WEIGHTS,
         )
-        self.spinning, self.result_message, self.spin_start_time = False, None, 0
-        self.spin_duration, self.slots_display = 1000, [  # Spin duration in ms
-            random.choices(self.symbols, weights=self.weights, k=1)[0] for _ in range(3)
+        self.rng = random.Random(seed)
+        self.sampler = symbol_sampler(self.weights)  # O(1) weighted symbol draws
+
+        # The animation scrolls through these strips, the outcome is drawn separately
+        self.reel_strips = [
+            [
+                self.symbols[i]
+                for i in self.sampler.sample_many(
+                    Config.SLOT_REEL_STRIP_LENGTH, self.rng
+                )
+            ]
+            for _ in range(3)
         ]
+        self.reel_offsets = [0, 0, 0]
+        self.spin_outcome = None
+
+        self.spinning, self.result_message, self.spin_start_time = False, None, 0
+        self.spin_duration, self.slots_display = 1000, self._draw_symbols()
         self.spin_sound_playing, self.cheat_activated = False, False
-        self.bet_amount, self.bet_options = 100, [100, 200, 500, 1000]
-        self.slot_font = self.assets.get_font(
-            "segoe ui symbol", 80
-        )  # Cache font for symbols
+        self.bet_amount, self.bet_options = 100, list(Config.SLOT_BET_OPTIONS)
+
+    def _draw_symbols(self):
+        return [self.symbols[self.sampler.sample(self.rng)] for _ in range(3)]
+
+    def _start_spin(self, time_now):
+        # The outcome is decided up front, the animation only scrolls the reel strips
+        self.spinning = True
+        self.spin_start_time = time_now
+        if self.cheat_activated:
+            self.spin_outcome = ["7️⃣", "7️⃣", "7️⃣"]
+        else:
+            self.spin_outcome = self._draw_symbols()
+        self.reel_offsets = [
+            self.rng.randrange(Config.SLOT_REEL_STRIP_LENGTH) for _ in range(3)
+        ]
+
+    def _animate_reels(self, elapsed):
+        step = elapsed // Config.SLOT_REEL_STEP_MS
+        self.slots_display = [
+            strip[(offset + step) % len(strip)]
+            for strip, offset in zip(self.reel_strips, self.reel_offsets)
+        ]
 
     def _handle_spin_result(self):
         self.spinning, self.spin_sound_playing = False, False
-        if self.cheat_activated:
-            self.slots_display, self.cheat_activated = ["7️⃣", "7️⃣", "7️⃣"], False
+        self.slots_display = list(self.spin_outcome)
+        self.cheat_activated = False
 
-        s1, s2, s3 = self.slots_display[0], self.slots_display[1], self.slots_display[2]
+        winnings, kind, symbol, multiplier = spin_payout(
+            self.slots_display, self.bet_amount, self.slot_values
+        )
+        self.score += winnings
 
-        if s1 == s2 == s3:  # Three of a kind
-            symbol = s1
-            multiplier = self.slot_values.get(symbol, 0)
-            winnings = int(self.bet_amount * multiplier)
-            self.score += winnings
+        if kind == THREE_OF_A_KIND:
             if multiplier > 0:
                 self.result_message = f"JACKPOT! {multiplier}x WIN!"
                 self.assets.play_sound("jackpot")
@@ -52,33 +86,12 @@ class SlotMachine:
             else:  # Multiplier is 0 (e.g. for Cherries if they pay 0 for 3)
                 self.result_message = "No win this time."
                 self.assets.play_sound("dangit")
-
-        else:  # Check for two of a kind (simple check, not all slot machine paylines)
-            counts = Counter(self.slots_display)
-            payout_made = False
-            for symbol, count in counts.items():
-                if count == 2:
-                    # Simplified: any two match gives a small payout (e.g., 0.5x or specific value)
-                    # For this example, let's say two of any non-7, non-Diamond pays back half bet
-                    # and two 7s or two Diamonds pay 1x bet.
-                    two_match_multiplier = 0
-                    if symbol == "7️⃣" or symbol == "💎":
-                        two_match_multiplier = 1.0
-                    elif self.slot_values.get(symbol, 0) > 0:  # Any other paying symbol
-                        two_match_multiplier = 0.5
-
-                    if two_match_multiplier > 0:
-                        winnings = int(self.bet_amount * two_match_multiplier)
-                        self.score += winnings
-                        self.result_message = (
-                            f"Two {symbol}! {two_match_multiplier:.1f}x bet!"
-                        )
-                        self.assets.play_sound("tap")  # Smaller win sound
-                        payout_made = True
-                        break
-            if not payout_made:
-                self.result_message = "No matches. Try again?"
-                self.assets.play_sound("dangit")
+        elif kind == TWO_OF_A_KIND and multiplier > 0:
+            self.result_message = f"Two {symbol}! {multiplier:.1f}x bet!"
+            self.assets.play_sound("tap")  # Smaller win sound
+        else:
+            self.result_message = "No matches. Try again?"
+            self.assets.play_sound("dangit")
 
     def _draw_ui(self):
         self.surface.fill((20, 0, 40))  # Dark purple background
@@ -91,7 +104,7 @@ class SlotMachine:
             "impact",
             True,
         )
-        self.renderer.draw_text(
+        score_rect = self.renderer.draw_text(
             f"Current Score: {self.score}",
             30,
             (255, 255, 255),
@@ -99,12 +112,16 @@ class SlotMachine:
             130,
             center_x=True,
         )
+        self.renderer.track_region("slot_score", self.score, score_rect)
 
         # Slot display area
         slot_area_x = Config.S_WIDTH // 2 - 225
         slot_area_y = 180
         slot_width = 140
         slot_spacing = 10
+        reels_rect = pygame.Rect(
+            slot_area_x, slot_area_y, 3 * slot_width + 2 * slot_spacing, 140
+        )
 
         for i, sym_char in enumerate(self.slots_display):
             rect_x = slot_area_x + i * (slot_width + slot_spacing)
@@ -114,8 +131,8 @@ class SlotMachine:
             )  # Darker slot background
             pygame.draw.rect(self.surface, (180, 180, 200), slot_rect, 4)  # Border
 
-            sym_surf = self.slot_font.render(
-                sym_char, True, (255, 255, 220)
+            sym_surf = self.assets.render_text(
+                sym_char, 80, (255, 255, 220), "segoe ui symbol"
             )  # Off-white symbols
             self.surface.blit(
                 sym_surf,
@@ -125,8 +142,11 @@ class SlotMachine:
                 ),
             )
 
+        self.renderer.track_region("slot_reels", tuple(self.slots_display), reels_rect)
+
+        result_rect = None
         if self.result_message:
-            self.renderer.draw_text(
+            message_rect = self.renderer.draw_text(
                 self.result_message,
                 35,
                 (255, 215, 0),
@@ -134,7 +154,7 @@ class SlotMachine:
                 360,
                 center_x=True,
             )
-            self.renderer.draw_text(  # Display new score below result message
+            score_line_rect = self.renderer.draw_text(  # New score below result
                 f"Score: {self.score}",
                 30,
                 (255, 255, 255),
@@ -142,6 +162,10 @@ class SlotMachine:
                 400,
                 center_x=True,
             )
+            result_rect = message_rect.union(score_line_rect)
+        self.renderer.track_region(
+            "slot_result", (self.result_message, self.score), result_rect
+        )
 
         # Buttons
         btn_y_start = 450
@@ -183,6 +207,7 @@ class SlotMachine:
         bet_start_x = Config.S_WIDTH // 2 - total_bet_btns_width // 2
 
         self.bet_button_rects = []
+        bets_rect = None
         for i, bet in enumerate(self.bet_options):
             bet_r = pygame.Rect(
                 bet_start_x + i * (bet_btn_width + 10),
@@ -191,6 +216,7 @@ class SlotMachine:
                 btn_height,
             )
             self.bet_button_rects.append(bet_r)
+            bets_rect = bet_r if bets_rect is None else bets_rect.union(bet_r)
             color = (
                 (0, 150, 0) if self.bet_amount == bet else (100, 100, 0)
             )  # Highlight selected bet
@@ -207,7 +233,7 @@ class SlotMachine:
                 center_x=True,
                 center_y=True,
             )
-        self.renderer.draw_text(
+        bet_label_rect = self.renderer.draw_text(
             f"Current Bet: {self.bet_amount}",
             18,
             (255, 255, 255),
@@ -215,6 +241,14 @@ class SlotMachine:
             bet_btn_y - 25,
             center_x=True,
         )
+        self.renderer.track_region(
+            "slot_bets", self.bet_amount, bets_rect.union(bet_label_rect)
+        )
+        self.renderer.track_region(
+            "slot_buttons",
+            self.spinning,
+            self.spin_btn_rect.unionall([self.cheat_btn_rect, self.deposit_btn_rect]),
+        )
 
         if not self.spinning:
             # Spin Button
@@ -302,7 +336,7 @@ class SlotMachine:
         self.result_message = "Place your bet and spin!"  # Initial message
 
         while running:
-            time_now = pygame.time.get_ticks()
+            time_now = ticks_ms()
             mouse_pos = pygame.mouse.get_pos()
 
             for event in pygame.event.get():
@@ -316,15 +350,7 @@ class SlotMachine:
                         if self.spin_btn_rect.collidepoint(mouse_pos):
                             if self.score >= self.bet_amount:
                                 self.score -= self.bet_amount
-                                self.spinning = True
-                                self.spin_start_time = time_now
-                                # Initial random display before "spinning" animation
-                                self.slots_display = [
-                                    random.choices(
-                                        self.symbols, weights=self.weights, k=1
-                                    )[0]
-                                    for _ in range(3)
-                                ]
+                                self._start_spin(time_now)
                                 self.result_message = None  # Clear previous result
                                 self.spin_sound_playing = (
                                     False  # Reset for next spin sound
@@ -339,8 +365,7 @@ class SlotMachine:
                         elif self.cheat_btn_rect.collidepoint(mouse_pos):
                             # Cheat spin doesn't require bet, for fun
                             self.cheat_activated = True
-                            self.spinning = True
-                            self.spin_start_time = time_now
+                            self._start_spin(time_now)
                             self.result_message = None
                             self.spin_sound_playing = False
                             self.assets.play_sound("coinhandle")
@@ -373,18 +398,12 @@ class SlotMachine:
                     self.spin_sound_playing = True  # Prevent replaying
 
                 if time_now - self.spin_start_time < self.spin_duration:
-                    # Animate slots by changing symbols rapidly
-                    if (
-                        time_now - self.spin_start_time
-                    ) % 100 < 50:  # Change every 100ms for visual effect
-                        self.slots_display = [
-                            random.choices(self.symbols, weights=self.weights, k=1)[0]
-                            for _ in range(3)
-                        ]
+                    # Animate slots by scrolling the pre-generated reel strips
+                    self._animate_reels(time_now - self.spin_start_time)
                 else:  # Spin duration ended
                     self._handle_spin_result()  # Determine outcome
 
             self._draw_ui()
-            pygame.display.update()
+            self.renderer.present("slot_machine")
             clock.tick(30)  # FPS for slot machine screen
         return self.score  # Should be unreachable if exit button works
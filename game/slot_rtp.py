@@ -0,0 +1,135 @@
+import argparse
+import itertools
+from fractions import Fraction
+from functools import lru_cache
+from .config import Config
+from .paytable import spin_payout
+
+# Exact return-to-player for the slot machine: every weighted 3-reel outcome is
+# enumerated once with exact fractions, payouts come from paytable.spin_payout,
+# the same function SlotMachine uses. Run with: python -m game.slot_rtp
+
+
+# --- Outcome Enumeration ---
+@lru_cache(maxsize=None)
+def weighted_outcomes(symbols=None, weights=None):
+    # Tuple of (reels, probability) for all len(symbols)**3 ordered outcomes
+    symbols = tuple(Config.SLOT_SYMBOLS) if symbols is None else symbols
+    weights = tuple(Config.SLOT_WEIGHTS) if weights is None else weights
+    total = sum(weights)
+    probabilities = [Fraction(w, total) for w in weights]
+    return tuple(
+        (
+            tuple(symbols[i] for i in combo),
+            probabilities[combo[0]] * probabilities[combo[1]] * probabilities[combo[2]],
+        )
+        for combo in itertools.product(range(len(symbols)), repeat=3)
+    )
+
+
+def _paytable_key():
+    # Snapshot of the current Config paytable, so re-tuning it invalidates the cache
+    return (
+        tuple(Config.SLOT_SYMBOLS),
+        tuple(Config.SLOT_WEIGHTS),
+        tuple(sorted(Config.SLOT_VALUES.items())),
+        tuple(sorted(Config.SLOT_PAIR_VALUES.items())),
+        Config.SLOT_PAIR_DEFAULT,
+    )
+
+
+# --- Statistics ---
+def paytable_stats(bet_amount=100):
+    return _paytable_stats(bet_amount, _paytable_key())
+
+
+@lru_cache(maxsize=64)
+def _paytable_stats(bet_amount, paytable_key):
+    symbols, weights, slot_values, pair_values, _ = paytable_key
+    slot_values, pair_values = dict(slot_values), dict(pair_values)
+
+    outcomes = []
+    expected = Fraction(0)
+    expected_sq = Fraction(0)
+    hit_probability = Fraction(0)
+    for reels, probability in weighted_outcomes(symbols, weights):
+        winnings, kind, symbol, multiplier = spin_payout(
+            reels, bet_amount, slot_values, pair_values
+        )
+        expected += probability * winnings
+        expected_sq += probability * winnings * winnings
+        if winnings > 0:
+            hit_probability += probability
+        outcomes.append(
+            {
+                "reels": reels,
+                "probability": probability,
+                "winnings": winnings,
+                "kind": kind,
+                # Share of the bet returned through this outcome, sums to the RTP
+                "rtp_contribution": probability * winnings / bet_amount,
+            }
+        )
+
+    variance = expected_sq - expected * expected
+    return {
+        "bet": bet_amount,
+        "rtp": expected / bet_amount,  # Exact Fraction
+        "expected_win": expected,
+        "house_edge": 1 - expected / bet_amount,
+        "hit_frequency": hit_probability,
+        "variance": variance,  # Of the winnings per spin, in points squared
+        "std_dev": float(variance) ** 0.5,
+        "outcomes": tuple(outcomes),
+    }
+
+
+def format_report(stats, top=15):
+    lines = [
+        f"Bet: {stats['bet']}",
+        f"RTP: {float(stats['rtp']):.6%} ({stats['rtp']})",
+        f"House edge: {float(stats['house_edge']):.6%}",
+        f"Hit frequency: {float(stats['hit_frequency']):.6%}",
+        f"Expected win per spin: {float(stats['expected_win']):.4f}",
+        f"Variance per spin: {float(stats['variance']):.4f}",
+        f"Std dev per spin: {stats['std_dev']:.4f}",
+    ]
+    paying = [o for o in stats["outcomes"] if o["winnings"] > 0]
+    paying.sort(key=lambda o: o["rtp_contribution"], reverse=True)
+    if top:
+        paying = paying[:top]
+    lines.append("")
+    lines.append(f"{'Reels':<14}{'Probability':>14}{'Win':>8}{'RTP share':>12}")
+    for outcome in paying:
+        lines.append(
+            f"{' '.join(outcome['reels']):<14}"
+            f"{float(outcome['probability']):>14.6%}"
+            f"{outcome['winnings']:>8}"
+            f"{float(outcome['rtp_contribution']):>12.6%}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exact slot machine RTP report")
+    parser.add_argument(
+        "--bet",
+        type=int,
+        nargs="+",
+        default=Config.SLOT_BET_OPTIONS,
+        help="Bet sizes",
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="Paying outcomes to list (0 = all)"
+    )
+    args = parser.parse_args(argv)
+    if any(bet <= 0 for bet in args.bet):
+        parser.error("--bet sizes must be positive")
+    for i, bet in enumerate(args.bet):
+        if i:
+            print()
+        print(format_report(paytable_stats(bet), args.top))
+
+
+if __name__ == "__main__":
+    main()
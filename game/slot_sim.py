@@ -0,0 +1,165 @@
+import argparse
+import time
+import numpy as np
+from .config import Config
+from .parallel import parallel_map
+from .slot_rtp import weighted_outcomes
+from .paytable import spin_payout
+
+# Monte Carlo bankroll simulator: plays whole slot sessions bet by bet, starting
+# from a Tetris score, until the score can't cover the bet (ruin) or max_spins.
+# Payouts per outcome come from paytable.spin_payout, the function SlotMachine
+# uses, so the numbers follow any paytable change.
+# Run with: python -m game.slot_sim --sessions 1000000
+
+PERCENTILES = (1, 10, 25, 50, 75, 90, 99)
+
+
+# --- Outcome Tables ---
+def outcome_tables(bet_amount):
+    # (probabilities, net score change per spin) over all weighted outcomes
+    outcomes = weighted_outcomes(tuple(Config.SLOT_SYMBOLS), tuple(Config.SLOT_WEIGHTS))
+    probabilities = np.array([float(p) for _, p in outcomes])
+    net = np.array(
+        [spin_payout(reels, bet_amount)[0] - bet_amount for reels, _ in outcomes],
+        dtype=np.int64,
+    )
+    return probabilities / probabilities.sum(), net
+
+
+# --- Session Simulation ---
+def simulate_sessions(sessions, bet_amount, start_score, max_spins, seed=None):
+    # Vectorized over sessions; returns (spins_to_ruin, peak_score, final_score).
+    # spins_to_ruin is -1 for sessions still solvent after max_spins.
+    rng = np.random.default_rng(seed)
+    probabilities, net = outcome_tables(bet_amount)
+    cumulative = np.cumsum(probabilities)
+    cumulative[-1] = 1.0  # Guard against float round-off in searchsorted
+
+    score = np.full(sessions, start_score, dtype=np.int64)
+    peak = score.copy()
+    ruin = np.where(score < bet_amount, 0, -1)
+
+    # Work on compacted copies of the still-solvent sessions, written back on ruin
+    active = np.flatnonzero(ruin < 0)
+    active_score = score[active]
+    active_peak = peak[active]
+    spin = 0
+    while len(active) and spin < max_spins:
+        spin += 1
+        draws = np.searchsorted(cumulative, rng.random(len(active)), side="right")
+        active_score += net[draws]
+        np.maximum(active_peak, active_score, out=active_peak)
+        busted = active_score < bet_amount
+        if busted.any():
+            done = active[busted]
+            ruin[done] = spin
+            score[done] = active_score[busted]
+            peak[done] = active_peak[busted]
+            kept = ~busted
+            active, active_score, active_peak = (
+                active[kept],
+                active_score[kept],
+                active_peak[kept],
+            )
+    score[active] = active_score
+    peak[active] = active_peak
+    return ruin, peak, score
+
+
+def _simulate_chunk(args):
+    return simulate_sessions(*args)
+
+
+def run_simulation(
+    sessions, bet_amount, start_score, max_spins, workers=None, seed=None, chunk=100_000
+):
+    # Splits the sessions into chunks played across a process pool
+    if sessions < 1:
+        raise ValueError(f"sessions must be at least 1, got {sessions}")
+    chunk_sizes = [chunk] * (sessions // chunk)
+    if sessions % chunk:
+        chunk_sizes.append(sessions % chunk)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    jobs = [
+        (size, bet_amount, start_score, max_spins, chunk_seed)
+        for size, chunk_seed in zip(chunk_sizes, seeds)
+    ]
+    results = list(parallel_map(_simulate_chunk, jobs, workers))
+    return tuple(np.concatenate(parts) for parts in zip(*results))
+
+
+def summarize(ruin, peak, final, bet_amount, start_score, max_spins):
+    if not len(ruin):
+        raise ValueError("Cannot summarize zero sessions")
+    busted = ruin >= 0
+    summary = {
+        "bet": bet_amount,
+        "start_score": start_score,
+        "sessions": len(ruin),
+        "max_spins": max_spins,
+        "ruin_probability": float(busted.mean()),
+        "spins_to_ruin": {},
+        "peak_score": dict(zip(PERCENTILES, np.percentile(peak, PERCENTILES))),
+        "final_score": dict(zip(PERCENTILES, np.percentile(final, PERCENTILES))),
+        "mean_final_score": float(final.mean()),
+    }
+    if busted.any():
+        spins = ruin[busted]
+        summary["spins_to_ruin"] = dict(
+            zip(PERCENTILES, np.percentile(spins, PERCENTILES))
+        )
+        summary["mean_spins_to_ruin"] = float(spins.mean())
+    return summary
+
+
+def format_summary(summary):
+    def row(label, values):
+        cells = "".join(f"{v:>10.0f}" for v in values.values())
+        return f"{label:<16}{cells}"
+
+    header = "".join(f"{'p' + str(p):>10}" for p in PERCENTILES)
+    lines = [
+        f"Bet {summary['bet']} from {summary['start_score']} points, "
+        f"{summary['sessions']} sessions, up to {summary['max_spins']} spins",
+        f"Ruin probability: {summary['ruin_probability']:.4%}",
+        f"{'':<16}{header}",
+    ]
+    if summary["spins_to_ruin"]:
+        lines.append(row("Spins to ruin", summary["spins_to_ruin"]))
+    lines.append(row("Peak score", summary["peak_score"]))
+    lines.append(row("Final score", summary["final_score"]))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Slot machine bankroll simulator")
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--bets", type=int, nargs="+", default=Config.SLOT_BET_OPTIONS)
+    parser.add_argument("--start-score", type=int, default=10_000)
+    parser.add_argument("--max-spins", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    if args.sessions < 1:
+        parser.error("--sessions must be at least 1")
+
+    for i, bet in enumerate(args.bets):
+        started = time.perf_counter()
+        ruin, peak, final = run_simulation(
+            args.sessions,
+            bet,
+            args.start_score,
+            args.max_spins,
+            args.workers,
+            None if args.seed is None else args.seed + i,
+        )
+        summary = summarize(ruin, peak, final, bet, args.start_score, args.max_spins)
+        if i:
+            print()
+        print(format_summary(summary))
+        print(f"({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import argparse
+import mmap
+import os
+import struct
+import pygame
+from .config import Config
+
+# Packed sound bank: every sound in assets.SOUND_FILES decoded once, offline, into
+# the mixer's sample format and stored back to back behind an index, so startup
+# opens and memory-maps one file instead of parsing 20 WAVs. AssetManager uses it
+# when its format matches the running mixer and falls back to the WAVs otherwise,
+# and per clip for any WAV edited since the bank was built.
+#   header  BANK_HEADER: magic, version, frequency, format, channels, sound count
+#   index   one INDEX_ENTRY per sound: name, byte offset, byte length, and the
+#           size and mtime of the WAV it was decoded from
+#   data    raw samples, each clip starting on an ALIGN boundary
+# Run with: python -m game.soundbank build
+#           python -m game.soundbank info
+
+MAGIC = b"TSND"
+VERSION = 2  # 2: source size and mtime in the index
+BANK_HEADER = struct.Struct("<4sHihHI")
+INDEX_ENTRY = struct.Struct("<32sQQQq")
+ALIGN = 16
+
+
+class SoundBankError(ValueError):
+    pass
+
+
+# --- Build ---
+def build(files, path=None):
+    # Decodes files (name -> WAV path) with the already initialized mixer and
+    # writes the bank
+    path = Config.SOUND_BANK if path is None else path
+    names = list(files)
+    frequency, sample_format, channels = pygame.mixer.get_init()
+    clips = [pygame.mixer.Sound(files[name]).get_raw() for name in names]
+
+    offset = BANK_HEADER.size + INDEX_ENTRY.size * len(names)
+    index = []
+    for name, clip in zip(names, clips):
+        if len(name.encode()) > 32:
+            raise SoundBankError(f"Sound name too long for the bank index: {name}")
+        offset += -offset % ALIGN
+        source = os.stat(files[name])
+        index.append(
+            INDEX_ENTRY.pack(
+                name.encode(), offset, len(clip), source.st_size, source.st_mtime_ns
+            )
+        )
+        offset += len(clip)
+
+    # Write-then-rename, a half written bank must never be picked up
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(
+            BANK_HEADER.pack(
+                MAGIC, VERSION, frequency, sample_format, channels, len(names)
+            )
+        )
+        f.write(b"".join(index))
+        for clip in clips:
+            f.write(bytes(-f.tell() % ALIGN))
+            f.write(clip)
+    os.replace(temp_path, path)
+    return path
+
+
+# --- Sound Bank ---
+class SoundBank:
+    def __init__(self, path=None):
+        self.path = Config.SOUND_BANK if path is None else path
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_index()
+        except (SoundBankError, struct.error):
+            self._map.close()
+            raise
+        self._view = memoryview(self._map)
+
+    def _read_index(self):
+        if len(self._map) < BANK_HEADER.size:
+            raise SoundBankError(f"{self.path} is not a sound bank")
+        magic, version, frequency, sample_format, channels, count = (
+            BANK_HEADER.unpack_from(self._map)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise SoundBankError(f"{self.path} is not a version {VERSION} sound bank")
+        # Same layout as pygame.mixer.get_init()
+        self.format = (frequency, sample_format, channels)
+        self.entries = {}  # name -> (offset, length, source size, source mtime_ns)
+        self.stale = []  # Names dropped by drop_stale()
+        for i in range(count):
+            name, offset, length, size, mtime_ns = INDEX_ENTRY.unpack_from(
+                self._map, BANK_HEADER.size + i * INDEX_ENTRY.size
+            )
+            if offset + length > len(self._map):
+                raise SoundBankError(f"{self.path} is truncated")
+            self.entries[name.rstrip(b"\0").decode()] = (
+                offset,
+                length,
+                size,
+                mtime_ns,
+            )
+
+    def drop_stale(self, files):
+        # Forgets every clip whose WAV in files (name -> path) changed size or mtime
+        # since the build, so it gets decoded from the WAV instead of played out of
+        # date. A missing WAV keeps its clip, there is nothing fresher to play
+        for name, path in files.items():
+            entry = self.entries.get(name)
+            if entry is None:
+                continue
+            try:
+                source = os.stat(path)
+            except OSError:
+                continue
+            if (source.st_size, source.st_mtime_ns) != entry[2:]:
+                del self.entries[name]
+                self.stale.append(name)
+        return self.stale
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def matches_mixer(self):
+        return pygame.mixer.get_init() == self.format
+
+    def sound(self, name):
+        # The clip's pages are only read in here; pygame copies the samples into the
+        # new Sound, nothing is decoded or converted
+        offset, length = self.entries[name][:2]
+        return pygame.mixer.Sound(buffer=self._view[offset : offset + length])
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+
+
+def open_sound_bank(path=None, files=None):
+    # (bank, None) if it exists and fits the running mixer, else (None, reason) and
+    # the WAVs are used. Given files (name -> WAV path), clips out of date with
+    # their WAV are dropped from the bank and listed in bank.stale
+    path = Config.SOUND_BANK if path is None else path
+    if not os.path.exists(path):
+        return None, f"{path} not built"
+    try:
+        bank = SoundBank(path)
+    except (OSError, ValueError) as e:
+        return None, str(e)
+    if not bank.matches_mixer():
+        reason = (
+            f"{path} was built for {bank.format}, "
+            f"mixer runs {pygame.mixer.get_init()}"
+        )
+        bank.close()
+        return None, reason
+    if files is not None:
+        bank.drop_stale(files)
+    return bank, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Packed sound bank")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="Pack the game's sounds")
+    build_parser.add_argument("--output", default=Config.SOUND_BANK)
+    build_parser.add_argument(
+        "--frequency", type=int, default=0, help="Mixer frequency (0: pygame default)"
+    )
+    build_parser.add_argument("--size", type=int, default=0, help="e.g. -16")
+    build_parser.add_argument("--channels", type=int, default=0)
+    info_parser = commands.add_parser("info", help="List a bank's contents")
+    info_parser.add_argument("path", nargs="?", default=Config.SOUND_BANK)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        from .assets import SOUND_FILES  # assets imports this module
+
+        pygame.mixer.init(args.frequency, args.size, args.channels)
+        path = build(SOUND_FILES, args.output)
+        mixer_format = pygame.mixer.get_init()
+        print(f"Packed {len(SOUND_FILES)} sounds {mixer_format} into {path}")
+        return 0
+
+    bank = SoundBank(args.path)
+    frequency, sample_format, channels = bank.format
+    print(f"{args.path}: {frequency} Hz, format {sample_format}, {channels} channels")
+    bytes_per_second = frequency * channels * abs(sample_format) // 8
+    for name, (offset, length, _, _) in bank.entries.items():
+        print(f"{name:<20}{offset:>12}{length:>12}{length / bytes_per_second:>9.2f} s")
+    bank.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
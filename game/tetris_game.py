@@ -1,11 +1,33 @@
+import os
+import random
+import time
 import pygame
+from .autoplayer import AutoPlayer
 from .config import Config
-from .game_logic import GameLogic
+from .engine import TetrisEngine
+from .profiler import FrameProfiler
+from .replay import CODE_ACTIONS, PAUSE, TICK, ReplayRecorder, replay_path
+from .timing import FramePacer, ticks_ms
 from .slot_machine import SlotMachine
 
-# Piece is used by GameLogic.
+# Rules live in TetrisEngine (pygame-free), this class is the pygame front end:
+# input, timing, sound, popups and rendering.
 # AssetManager, Renderer, UIManager, PopupManager are passed in constructor.
 
+KEY_ACTIONS = {
+    pygame.K_LEFT: "left",
+    pygame.K_RIGHT: "right",
+    pygame.K_DOWN: "down",  # Soft drop
+    pygame.K_UP: "rotate",
+    pygame.K_SPACE: "hard_drop",
+    pygame.K_LSHIFT: "hold",
+    pygame.K_RSHIFT: "hold",
+    pygame.K_c: "hold",
+}
+AUTOPLAY_KEY = pygame.K_b  # Toggles the bot
+PROFILER_KEY = pygame.K_F3  # Toggles the frame profiler overlay
+PROFILER_DUMP_KEY = pygame.K_F4  # Writes the profiler buffers to CSV
+
 
 # --- Tetris Game Class ---
 class TetrisGame:
@@ -16,50 +38,110 @@ class TetrisGame:
         self.ui_manager = ui_manager  # UIManager instance
         self.popup_manager = popup_manager  # PopupManager instance
 
-        self.game_logic = GameLogic()
+        self.engine = TetrisEngine()
+        self.autoplayer = AutoPlayer()
+        self.autoplay = False  # Stays on across games until toggled off
+        self.profiler = FrameProfiler()  # Always recording, the overlay is optional
+        self.show_profiler = False
         self.clock = pygame.time.Clock()
+        self.pacer = FramePacer()  # Fixed logic ticks, render cap
+        self.recorder = None  # ReplayRecorder of the game in progress
+        self.last_replay_path = None
         self._reset_game_state()
 
     def _reset_game_state(self):
-        self.game_logic = GameLogic()
-        self.score = 0
-        self.fall_time = 0
-        self.level_time = 0  # Time accumulator for increasing fall speed
-        self.fall_speed = 0.35  # Initial fall speed (seconds per step)
-        self.min_fall_speed = 0.05  # Fastest possible fall speed
-        self.speed_increase_interval = 15  # Increase speed every X seconds
-        self.speed_increase_amount = 0.015  # Amount to decrease fall_speed by
-
-        self.current_piece = self.game_logic.get_random_piece()
-        self.next_piece = self.game_logic.get_random_piece()
-        self.held_piece = None
-        self.can_hold = True
-        self.first_piece_placed = False
-
-        self.popup_manager.popups.clear()  # Clear any existing popups
-
-        self.start_time_ticks = pygame.time.get_ticks()  # For survival time
-        self.total_lines_cleared = 0
+        self.popup_manager.clear()  # Clear any existing popups
+        # Keep unfinished games too (restart from pause); a failed save's popup
+        # shows in the new game
+        self._save_replay()
+        self.engine.reset(random.getrandbits(32))  # Fresh seed, saved in the replay
+        if Config.REPLAY_ENABLED:
+            self.recorder = ReplayRecorder(self.engine)
+        self.autoplayer.reset()
+        self.pacer.reset()
+        self.clock.tick()  # Time spent in menus isn't game time
+
+        self.start_time_ticks = ticks_ms()  # For survival time
         self.pause_start_time = 0
         self.paused_duration = 0  # Accumulate total paused time
 
+    # Read-only views of the engine state used by rendering and the game over screen
+    @property
+    def game_logic(self):
+        return self.engine.game_logic
+
+    @property
+    def score(self):
+        return self.engine.score
+
+    @property
+    def current_piece(self):
+        return self.engine.current_piece
+
+    @property
+    def next_piece(self):
+        return self.engine.next_piece
+
+    @property
+    def held_piece(self):
+        return self.engine.held_piece
+
+    @property
+    def total_lines_cleared(self):
+        return self.engine.total_lines_cleared
+
+    def _step(self, action, dt_ms):
+        # Every engine step goes through here so the replay sees the same inputs
+        if self.recorder is None:
+            self._handle_engine_events(self.engine.step(action, dt_ms))
+            return
+        for action, dt_ms in self.recorder.record(action, dt_ms):
+            self._handle_engine_events(self.engine.step(action, dt_ms))
+
+    def _save_replay(self, survival_ms=None):
+        recorder, self.recorder = self.recorder, None
+        if recorder is None or not len(recorder.replay):
+            return None
+        if survival_ms is None:
+            survival_ms = self._survival_ms()
+        replay = recorder.finish(self.engine, survival_ms)
+        try:
+            self.last_replay_path = replay.save(replay_path(replay))
+        except OSError:
+            self.popup_manager.create_popup(
+                "REPLAY NOT SAVED", size=40, color=(200, 200, 200)
+            )
+            return None
+        return self.last_replay_path
+
+    def _dump_frame_timings(self):
+        try:
+            path = self.profiler.dump_csv()
+        except OSError:
+            message, color = "TIMINGS NOT SAVED", (200, 200, 200)
+        else:
+            message, color = os.path.basename(path), (150, 255, 150)
+        self.popup_manager.create_popup(message, size=30, color=color)
+
+    def _survival_ms(self):
+        # Wall-clock play time so far, pauses excluded
+        return ticks_ms() - self.start_time_ticks - self.paused_duration
+
     def _handle_input(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return "quit_application"
 
             if event.type == pygame.KEYDOWN:
-                if (
-                    not self.current_piece
-                ):  # No piece to control (should not happen in active game)
-                    continue
-
                 if event.key == pygame.K_ESCAPE:
-                    self.pause_start_time = pygame.time.get_ticks()
+                    self.pause_start_time = ticks_ms()
                     action = self.ui_manager.pause_menu()  # Show pause menu
-                    self.paused_duration += (
-                        pygame.time.get_ticks() - self.pause_start_time
-                    )
+                    paused_ms = ticks_ms() - self.pause_start_time
+                    self.paused_duration += paused_ms
+                    if self.recorder is not None:
+                        self.recorder.record_pause(paused_ms)
+                    self.clock.tick()  # Don't feed the paused time to gravity
+                    self.profiler.discard_frame()  # Nor to the frame timings
 
                     if action == "new_game":
                         return "new_game"
@@ -69,269 +151,212 @@ class TetrisGame:
                     if action == "resume":
                         self.assets.play_sound("tap")
 
-                elif event.key == pygame.K_LEFT:
-                    self.current_piece.x -= 1
-                    if not self.game_logic.valid_space(self.current_piece):
-                        self.current_piece.x += 1  # Revert if invalid
-                    else:
-                        self.assets.play_sound("tap")
+                elif event.key == PROFILER_KEY:
+                    self.show_profiler = not self.show_profiler
 
-                elif event.key == pygame.K_RIGHT:
-                    self.current_piece.x += 1
-                    if not self.game_logic.valid_space(self.current_piece):
-                        self.current_piece.x -= 1  # Revert
-                    else:
-                        self.assets.play_sound("tap")
+                elif event.key == PROFILER_DUMP_KEY:
+                    self._dump_frame_timings()
 
-                elif event.key == pygame.K_DOWN:  # Soft drop
-                    self.current_piece.y += 1
-                    if not self.game_logic.valid_space(self.current_piece):
-                        self.current_piece.y -= 1  # Revert
-                        return (
-                            "lock_piece"  # Attempt to lock if soft drop hits something
-                        )
-                    else:
-                        self.score += 1  # Small score for soft drop
-                        self.fall_time = 0  # Reset fall timer for responsiveness
-                        # No sound for soft drop to avoid noise
-
-                elif event.key == pygame.K_UP:  # Rotate
-                    original_rotation = self.current_piece.rotation
-                    self.current_piece.rotation = (
-                        self.current_piece.rotation + 1
-                    ) % len(self.current_piece.shape_format)
-                    if not self.game_logic.valid_space(self.current_piece):
-                        # Try wall kicks (simple ones)
-                        kicks = [
-                            (0, 0),
-                            (-1, 0),
-                            (1, 0),
-                            (-2, 0),
-                            (2, 0),
-                            (0, -1),
-                            (0, -2),
-                        ]  # Basic kicks
-                        kicked = False
-                        for dx, dy in kicks:
-                            self.current_piece.x += dx
-                            self.current_piece.y += dy
-                            if self.game_logic.valid_space(self.current_piece):
-                                kicked = True
-                                self.assets.play_sound("tap")
-                                break
-                            self.current_piece.x -= dx  # Revert kick
-                            self.current_piece.y -= dy
-                        if not kicked:
-                            self.current_piece.rotation = (
-                                original_rotation  # Revert rotation fully
-                            )
-                    else:
-                        self.assets.play_sound("tap")
+                elif event.key == AUTOPLAY_KEY:
+                    self.autoplay = not self.autoplay
+                    self.autoplayer.reset()
 
-                elif event.key == pygame.K_SPACE:  # Hard drop
-                    drop_distance = 0
-                    while self.game_logic.valid_space(self.current_piece):
-                        self.current_piece.y += 1
-                        drop_distance += 1
-                    self.current_piece.y -= 1  # Move back to last valid position
-                    if drop_distance > 0:
-                        self.score += drop_distance * 2  # Score for hard drop
-                    self.assets.play_sound(
-                        "firstblood"
-                    )  # Use a distinct sound for hard drop
-                    return "lock_piece"
-
-                elif event.key in [
-                    pygame.K_LSHIFT,
-                    pygame.K_RSHIFT,
-                    pygame.K_c,
-                ]:  # Hold piece
-                    self._hold_piece()
+                elif event.key in KEY_ACTIONS and not self.engine.game_over:
+                    self._step(KEY_ACTIONS[event.key], 0)
         return None  # No special action from input
 
-    def _hold_piece(self):
-        if self.can_hold and self.current_piece:  # Ensure there's a current piece
-            self.assets.play_sound("tap")
-            # Reset position of the piece being held before swapping
-            self.current_piece.x = Config.GRID_COLS // 2
-            self.current_piece.y = 1  # Standard spawn y
-            self.current_piece.rotation = 0
-
-            if self.held_piece is None:
-                self.held_piece, self.current_piece = (
-                    self.current_piece,
-                    self.next_piece,
-                )
-                self.next_piece = self.game_logic.get_random_piece()
-            else:
-                self.held_piece, self.current_piece = (
-                    self.current_piece,
-                    self.held_piece,
-                )
-
-            # Reset new current_piece's position and check validity
-            if self.current_piece:
-                self.current_piece.x = Config.GRID_COLS // 2
-                self.current_piece.y = 1  # Standard spawn y
-                self.current_piece.rotation = 0
-                if not self.game_logic.valid_space(self.current_piece):
-                    # This could be a game over condition if new piece from hold is invalid
-                    # For now, rely on the main loop's check_lost or next lock attempt
-                    pass
-            self.can_hold = False
-
-    def _update_game_state(self):  # Returns True if piece should be locked
-        if not self.current_piece:
-            return False  # Should not happen
-
-        self.fall_time += self.clock.get_rawtime()
-        self.level_time += self.clock.get_rawtime()
-
-        # Increase game speed over time
-        if self.level_time / 1000 > self.speed_increase_interval:
-            self.level_time = 0  # Reset timer for next speed increase
-            if self.fall_speed > self.min_fall_speed:
-                self.fall_speed = max(
-                    self.min_fall_speed, self.fall_speed - self.speed_increase_amount
+    def _autoplay_step(self):
+        # Bot moves go through _step like key presses, so replays capture them
+        for _ in range(Config.AUTOPLAY_ACTIONS_PER_FRAME):
+            if self.engine.game_over:
+                break
+            self._step(self.autoplayer.next_action(self.engine), 0)
+
+    def _handle_engine_events(self, events):
+        for name, value in events:
+            if name == "move" or name == "hold":
+                self.assets.play_sound("tap")
+            elif name == "hard_drop":
+                # Use a distinct sound for hard drop
+                self.assets.play_sound("firstblood")
+            elif name == "first_lock":
+                self.assets.play_sound("firstblood")
+                self.popup_manager.create_popup(
+                    "FIRST BLOOD!", color=(220, 20, 60), size=60
                 )
+            elif name == "lock" and value > 0:
+                self._handle_lines_cleared(value)
+
+    def _handle_lines_cleared(self, lines):
+        line_sounds = {
+            1: "humiliation",
+            2: "multi_kill",
+            3: "mega_kill",
+            4: "ultra_kill",
+        }
+        line_popups = {1: "SINGLE!", 2: "DOUBLE!", 3: "TRIPLE!", 4: "TETRIS!"}
+        line_colors = {
+            1: (150, 150, 255),
+            2: (100, 255, 100),
+            3: (255, 150, 50),
+            4: (255, 50, 255),
+        }
+        popup_size = 50 + lines * 10  # Larger popups for more lines
+
+        self.assets.play_sound(line_sounds.get(lines, "tap"))
+        self.popup_manager.create_popup(
+            line_popups.get(lines, f"{lines} LINES!"),
+            color=line_colors.get(lines, (200, 200, 200)),
+            size=popup_size,
+        )
 
-        if self.fall_time / 1000 >= self.fall_speed:
-            self.fall_time = 0
-            self.current_piece.y += 1
-            if not self.game_logic.valid_space(self.current_piece):
-                self.current_piece.y -= 1  # Revert move
-                return True  # Signal to lock piece
-        return False  # Piece still falling or move was valid
-
-    def _handle_piece_locked(self):  # Returns True if game over after lock
-        if not self.current_piece:
-            return False
-
-        self.game_logic.lock_piece(self.current_piece)
-        # Sound for locking piece (hard drop has its own sound)
-        # self.assets.play_sound("tap") # Already played by hard drop or move validation
-
-        if not self.first_piece_placed:
-            self.assets.play_sound("firstblood")
-            self.popup_manager.create_popup(
-                "FIRST BLOOD!", color=(220, 20, 60), size=60
-            )
-            self.first_piece_placed = True
-
-        lines = self.game_logic.clear_rows()
-        self.total_lines_cleared += lines
-        if lines > 0:
-            base_scores = {1: 100, 2: 300, 3: 500, 4: 800}  # Standard Tetris scoring
-            self.score += base_scores.get(lines, 0) * (
-                self.total_lines_cleared // 10 + 1
-            )  # Basic level multiplier
-
-            line_sounds = {
-                1: "humiliation",
-                2: "multi_kill",
-                3: "mega_kill",
-                4: "ultra_kill",
-            }
-            line_popups = {1: "SINGLE!", 2: "DOUBLE!", 3: "TRIPLE!", 4: "TETRIS!"}
-            line_colors = {
-                1: (150, 150, 255),
-                2: (100, 255, 100),
-                3: (255, 150, 50),
-                4: (255, 50, 255),
-            }
-            popup_size = 50 + lines * 10  # Larger popups for more lines
-
-            self.assets.play_sound(line_sounds.get(lines, "tap"))
-            self.popup_manager.create_popup(
-                line_popups.get(lines, f"{lines} LINES!"),
-                color=line_colors.get(lines, (200, 200, 200)),
-                size=popup_size,
-            )
-
-        self.current_piece = self.next_piece
-        self.next_piece = self.game_logic.get_random_piece()
-        self.can_hold = True
-
-        # Check if the new piece is immediately invalid (game over)
-        if self.current_piece and not self.game_logic.valid_space(self.current_piece):
-            return True  # Game Over
+    def _draw_frame(self, current_piece, pending_ms=0):
+        # pending_ms: real time not simulated yet, used to draw the falling piece
+        # between gravity rows
+        profiler = self.profiler
+        piece_offset = 0
+        if Config.RENDER_INTERPOLATION and current_piece is not None:
+            progress = self.engine.fall_progress(pending_ms)
+            piece_offset = int(progress * Config.BLOCK_SIZE)
+        self.renderer.draw_main_tetris_window(
+            self.game_logic.grid,
+            self.score,
+            current_piece,
+            self.next_piece,
+            self.held_piece,
+            self.game_logic,
+            self.engine.upcoming_shapes()[1:],  # Next piece has its own panel
+            piece_offset,
+        )
+        self.renderer.draw_autoplay_label(self.autoplay)
+        profiler.mark("draw_main")
+        self.popup_manager.draw_popups(self.surface)
+        profiler.mark("draw_popups")
+        self.renderer.draw_profiler_overlay(profiler if self.show_profiler else None)
+        profiler.skip()
+        self.renderer.present("game")
+        profiler.mark("display_update")
+        profiler.end_frame()
+
+    def _show_final_frame(self, message):
+        self.assets.play_sound("oneandonly")  # Game over sound
+        # Final draw before showing game over screen
+        self.renderer.draw_main_tetris_window(
+            self.game_logic.grid,
+            self.score,
+            None,
+            self.next_piece,
+            self.held_piece,
+            self.game_logic,
+            self.engine.upcoming_shapes()[1:],
+        )
+        self.renderer.draw_text_middle(
+            message, 60, (255, 0, 0), "impact", True, y_offset=-20
+        )
+        self.popup_manager.draw_popups(self.surface)
+        self.renderer.mark_full_redraw()
+        self.renderer.present("game")
+        pygame.time.delay(2500)  # Pause to show final state
 
-        # Also check general game over condition (stack too high)
-        if self.game_logic.check_lost():
-            return True  # Game Over
+    def play_replay(self, replay):
+        # 1x rendered playback of a recorded game: real frame time is spent on the
+        # recorded ticks in order, inputs apply between them as they did live.
+        # Returns (next_view, score) like run_game.
+        live_engine, self.engine = self.engine, replay.new_engine()
+        self.popup_manager.clear()
+        profiler = self.profiler
+        records = list(replay)
+        position, pending_ms = 0, 0
+        self.clock.tick()
+        try:
+            while position < len(records):
+                pending_ms += self.clock.tick(self.pacer.fps)
+                profiler.begin_frame()
+                lock_ns = self.engine.lock_ns
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        return "quit_application", self.score
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                        return "main_menu", self.score
+
+                while position < len(records):
+                    code, dt_ms = records[position]
+                    if code == TICK:
+                        if dt_ms > pending_ms:
+                            break  # Not due yet, next frame
+                        pending_ms -= dt_ms
+                    if code != PAUSE:  # Paused time never reached the engine
+                        self._handle_engine_events(
+                            self.engine.step(CODE_ACTIONS.get(code), dt_ms)
+                        )
+                    position += 1
+                profiler.mark("update", "lock_clear", self.engine.lock_ns - lock_ns)
+                self._draw_frame(self.current_piece, pending_ms)
 
-        return False  # Game continues
+            self._show_final_frame("REPLAY OVER")
+            return "main_menu", self.score
+        finally:
+            self.engine = live_engine
+            self.popup_manager.clear()
 
     def run_game(self):
         self._reset_game_state()  # Ensure fresh state for each game run
         running = True
 
+        pacer, profiler = self.pacer, self.profiler
         while running:
-            self.clock.tick(60)  # Target FPS
+            frame_ms = self.clock.tick(pacer.fps)  # Render cap
+            frame_start = time.perf_counter()
+            profiler.begin_frame()
+            lock_ns = self.engine.lock_ns
 
             input_action = self._handle_input()
+            # Locks from key presses (hard drop) count as lock/clear, not input
+            profiler.mark("input", "lock_clear", self.engine.lock_ns - lock_ns)
+            lock_ns = self.engine.lock_ns
 
             if input_action == "quit_application":
+                self._save_replay()
                 return "quit_application", self.score
             if input_action == "new_game":
                 self._reset_game_state()  # Full reset for new game
                 continue  # Restart game loop immediately
             if input_action == "main_menu":
+                self._save_replay()
                 return "main_menu", self.score
 
-            should_lock_piece = False
-            if (
-                input_action == "lock_piece"
-            ):  # From hard drop or soft drop hitting bottom
-                should_lock_piece = True
-
-            if not should_lock_piece:  # If not locked by input, check natural fall
-                should_lock_piece = self._update_game_state()
-
-            if should_lock_piece:
-                if self._handle_piece_locked():  # If game over after locking
-                    running = False  # Exit game loop for game over sequence
-                    # No break here, let it draw one last frame then go to game over
-
-            # Drawing
-            self.renderer.draw_main_tetris_window(
-                self.game_logic.grid,
-                self.score,
-                self.current_piece,
-                self.next_piece,
-                self.held_piece,
-                self.game_logic,
+            if self.autoplay:
+                self._autoplay_step()
+
+            # Natural fall and speed-up, locking and game over are handled by the
+            # engine, in fixed ticks: as many as the real time since the last frame
+            # covers, so game speed doesn't depend on the frame rate
+            for _ in range(pacer.advance(frame_ms)):
+                self._step(None, pacer.tick_ms)
+                if self.engine.game_over:
+                    break
+            profiler.mark("update", "lock_clear", self.engine.lock_ns - lock_ns)
+            if self.engine.game_over:
+                running = False  # Draw one last frame, then go to game over
+            elif not pacer.should_render((time.perf_counter() - frame_start) * 1000):
+                profiler.end_frame()
+                continue  # Over budget: simulate on, show the next frame
+
+            draw_start = time.perf_counter()
+            self._draw_frame(self.current_piece, pacer.accumulator)
+            draw_end = time.perf_counter()
+            pacer.rendered(
+                (draw_end - draw_start) * 1000, (draw_end - frame_start) * 1000
             )
-            self.popup_manager.draw_popups(self.surface)
-            pygame.display.update()
-
-            # Check for game over if not already triggered by piece lock
-            if running and self.game_logic.check_lost():
-                running = False
 
-                # --- Game Over Sequence ---
-        self.assets.play_sound("oneandonly")  # Game over sound
-        # Final draw before showing game over screen
-        self.renderer.draw_main_tetris_window(
-            self.game_logic.grid,
-            self.score,
-            None,
-            self.next_piece,
-            self.held_piece,
-            self.game_logic,
-        )
-        self.renderer.draw_text_middle(
-            "GAME OVER", 60, (255, 0, 0), "impact", True, y_offset=-20
-        )
-        self.popup_manager.draw_popups(self.surface)
-        pygame.display.update()
-        pygame.time.delay(2500)  # Pause to show final state
+            # --- Game Over Sequence ---
+        # Calculate survival time accurately considering pauses; taken before the
+        # final frame's delay, and the same value goes into the replay
+        survival_ms = self._survival_ms()
+        self._save_replay(survival_ms)
+        self._show_final_frame("GAME OVER")
 
-        # Calculate survival time accurately considering pauses
-        total_elapsed_ticks = (
-            pygame.time.get_ticks() - self.start_time_ticks - self.paused_duration
-        )
-        time_survived_seconds = total_elapsed_ticks / 1000.0
+        time_survived_seconds = survival_ms / 1000.0
         time_survived_str = f"{time_survived_seconds:.1f}s"
 
         final_score_val, next_action_after_game_over = self.ui_manager.game_over_screen(
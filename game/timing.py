@@ -0,0 +1,81 @@
+from time import perf_counter_ns
+from .config import Config
+
+# Fixed-timestep pacing for the game loop: real frame time goes into an
+# accumulator that is drained in LOGIC_TICK_MS engine ticks, so gravity and speed-ups
+# run at the same rate whatever the frame rate. Rendering is capped separately
+# (optionally adapting to what the machine keeps up with) and skipped on frames
+# that are already over budget.
+
+_CLOCK_START_NS = perf_counter_ns()
+
+
+def ticks_ms():
+    # Milliseconds since startup, for what used pygame.time.get_ticks(); that one
+    # reads 0 unless pygame.init() ran, which the minimal startup path skips
+    return (perf_counter_ns() - _CLOCK_START_NS) // 1_000_000
+
+
+# --- Frame Pacer ---
+class FramePacer:
+    def __init__(self, tick_ms=None, render_fps=None, adaptive=None):
+        self.tick_ms = Config.LOGIC_TICK_MS if tick_ms is None else tick_ms
+        self.max_fps = Config.RENDER_FPS if render_fps is None else render_fps
+        self.adaptive = Config.RENDER_FPS_ADAPTIVE if adaptive is None else adaptive
+        self.min_fps = min(Config.RENDER_FPS_MIN, self.max_fps)
+        self.fps = self.max_fps  # Current render cap, for clock.tick()
+        self.reset()
+
+    def reset(self):
+        self.accumulator = 0  # Real time not yet simulated, ms
+        self.draw_ms = 0.0  # Moving average of draw + present time
+        self.work_ms = 0.0  # Moving average of a rendered frame's total work
+        self.skipped = 0  # Renders skipped in a row
+        self.dropped_ms = 0  # Backlog thrown away when too far behind
+        self._rendered_since_adjust = 0
+
+    @property
+    def budget_ms(self):
+        return 1000 / self.fps
+
+    def advance(self, frame_ms):
+        # Adds a frame's real time, returns how many logic ticks to run now
+        self.accumulator += frame_ms
+        ticks = int(self.accumulator // self.tick_ms)
+        if ticks > Config.MAX_TICKS_PER_FRAME:
+            # Too far behind (e.g. a stall): catch up what we can and drop the rest
+            # instead of spiralling
+            dropped = (ticks - Config.MAX_TICKS_PER_FRAME) * self.tick_ms
+            self.dropped_ms += dropped
+            self.accumulator -= dropped
+            ticks = Config.MAX_TICKS_PER_FRAME
+        self.accumulator -= ticks * self.tick_ms
+        return ticks
+
+    def should_render(self, work_ms):
+        # False when this frame's work so far plus a typical draw already blows
+        # the frame budget; never skips more than MAX_SKIPPED_RENDERS in a row
+        if (
+            work_ms + self.draw_ms > self.budget_ms
+            and self.skipped < Config.MAX_SKIPPED_RENDERS
+        ):
+            self.skipped += 1
+            return False
+        self.skipped = 0
+        return True
+
+    def rendered(self, draw_ms, work_ms):
+        # Feeds back a rendered frame's draw time and total work (update included).
+        # The adaptive cap is revisited about once a second: down while frames use
+        # most of their budget, back up once they fit comfortably.
+        self.draw_ms += (draw_ms - self.draw_ms) * 0.1
+        self.work_ms += (work_ms - self.work_ms) * 0.1
+        self._rendered_since_adjust += 1
+        if not self.adaptive or self._rendered_since_adjust < self.fps:
+            return
+        self._rendered_since_adjust = 0
+        budget = self.budget_ms
+        if self.work_ms > budget * 0.9 and self.fps > self.min_fps:
+            self.fps = max(self.min_fps, self.fps - 5)
+        elif self.work_ms < budget * 0.5 and self.fps < self.max_fps:
+            self.fps = min(self.max_fps, self.fps + 5)
@@ -0,0 +1,237 @@
+import argparse
+import json
+import os
+import time
+import numpy as np
+from .autoplayer import FEATURES, AutoPlayer, play_game
+from .config import Config
+from .engine import TetrisEngine
+from .parallel import parallel_map
+
+# Self-play tournament for tuning the autoplayer's evaluator weights. Every weight
+# vector of a generation plays the same seeded games (same piece sequences), games
+# run across a process pool, and results are engine scores, i.e. the live game's
+# LINE_SCORES x level scoring plus drop points.
+# Run with: python -m game.tournament search --checkpoint tuning.json
+#           python -m game.tournament eval --weights -0.51 0.76 -0.36 -0.18
+
+METHODS = ("cem", "evolve")
+# Left as None on the command line, so a resumed search can tell which of these
+# were asked for explicitly; the checkpoint's own values are used otherwise
+DEFAULTS = {"seed": 0, "method": "cem", "initial_std": 0.5}
+
+
+# --- Games ---
+def play_match(weights, seed, max_pieces, dt_ms=0):
+    # One headless bot game; returns (score, lines, pieces, topped_out)
+    engine = play_game(TetrisEngine(seed), AutoPlayer(weights), max_pieces, dt_ms)
+    return (
+        engine.score,
+        engine.total_lines_cleared,
+        engine.pieces_locked,
+        engine.game_over,
+    )
+
+
+def _play_job(args):
+    return play_match(*args)
+
+
+def run_matches(candidates, seeds, max_pieces, workers=None, dt_ms=0):
+    # Plays every candidate on every seed; returns an array [candidate, seed, field]
+    jobs = [
+        (tuple(weights), seed, max_pieces, dt_ms)
+        for weights in candidates
+        for seed in seeds
+    ]
+    results = list(parallel_map(_play_job, jobs, workers))
+    return np.array(results, dtype=np.int64).reshape(len(candidates), len(seeds), 4)
+
+
+def generation_seeds(seed, generation, games):
+    # Fresh piece sequences each generation, shared by all of its candidates
+    sequence = np.random.SeedSequence([seed, generation])
+    return [int(s) for s in sequence.generate_state(games)]
+
+
+# --- Search ---
+def new_state(args):
+    weights = Config.AUTOPLAY_WEIGHTS
+    return {
+        "method": args.method,
+        "seed": args.seed,
+        "initial_std": args.initial_std,
+        "generation": 0,
+        "mean": [weights[name] for name in FEATURES],
+        "std": [args.initial_std] * len(FEATURES),
+        "best_weights": None,
+        "best_fitness": None,
+        "history": [],
+    }
+
+
+def sample_candidates(state, population):
+    rng = np.random.default_rng([state["seed"], state["generation"], 1])
+    mean, std = np.array(state["mean"]), np.array(state["std"])
+    candidates = rng.normal(mean, std, size=(population, len(mean)))
+    if state["method"] == "evolve" and state["best_weights"] is not None:
+        candidates[0] = state["best_weights"]  # Elitism: the champion plays again
+    return candidates
+
+
+def update_state(state, candidates, fitness, elite_fraction, noise):
+    order = np.argsort(fitness)[::-1]
+    elite = candidates[order[: max(1, int(round(len(candidates) * elite_fraction)))]]
+    if state["method"] == "cem":
+        # Refit the sampling distribution to the elite, with decaying extra noise
+        # so it doesn't collapse early
+        extra = noise / (1 + state["generation"])
+        state["mean"] = elite.mean(axis=0).tolist()
+        state["std"] = (elite.std(axis=0) + extra).tolist()
+    else:
+        # Mutate around the generation's champion with a slowly shrinking step
+        state["mean"] = candidates[order[0]].tolist()
+        state["std"] = (np.array(state["std"]) * 0.95).tolist()
+
+    if state["best_fitness"] is None or fitness[order[0]] > state["best_fitness"]:
+        state["best_fitness"] = float(fitness[order[0]])
+        state["best_weights"] = candidates[order[0]].tolist()
+    state["history"].append(
+        {
+            "generation": state["generation"],
+            "best": float(fitness[order[0]]),
+            "mean": float(np.mean(fitness)),
+            "weights": candidates[order[0]].tolist(),
+        }
+    )
+    state["generation"] += 1
+
+
+def save_checkpoint(state, path):
+    # Write-then-rename, so an interrupted save keeps the previous checkpoint
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def format_weights(weights):
+    return ", ".join(f"{name} {w:+.4f}" for name, w in zip(FEATURES, weights))
+
+
+def resume_conflicts(state, args):
+    # Options given explicitly that disagree with the checkpoint being resumed
+    conflicts = []
+    for key in ("method", "seed", "initial_std"):
+        value = getattr(args, key)
+        if value is not None and key in state and value != state[key]:
+            option = "--" + key.replace("_", "-")
+            conflicts.append(f"{option} {value} (checkpoint: {state[key]})")
+    return conflicts
+
+
+def search(args, state=None):
+    if state is not None:
+        print(
+            f"Resuming {args.checkpoint} at generation {state['generation']} "
+            f"(method {state['method']}, seed {state['seed']})"
+        )
+    else:
+        state = new_state(args)
+
+    while state["generation"] < args.generations:
+        started = time.perf_counter()
+        candidates = sample_candidates(state, args.population)
+        seeds = generation_seeds(state["seed"], state["generation"], args.games)
+        results = run_matches(candidates, seeds, args.max_pieces, args.workers)
+        fitness = results[:, :, 0].mean(axis=1)  # Mean score over the seeds
+        generation = state["generation"]
+        update_state(state, candidates, fitness, args.elite, args.noise)
+        if args.checkpoint:
+            save_checkpoint(state, args.checkpoint)
+        print(
+            f"Gen {generation:>3}: best {fitness.max():>10.0f}, "
+            f"mean {fitness.mean():>10.0f}, "
+            f"lines {results[:, :, 1].mean(axis=1).max():>6.1f} "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+        print(f"         {format_weights(candidates[np.argmax(fitness)])}")
+
+    if state["best_weights"] is not None:
+        print()
+        print(f"Best mean score {state['best_fitness']:.0f} with")
+        print(f"    {format_weights(state['best_weights'])}")
+        weights = dict(zip(FEATURES, (round(w, 6) for w in state["best_weights"])))
+        print(f"    AUTOPLAY_WEIGHTS = {weights}")
+
+
+def evaluate(args):
+    weights = args.weights or [Config.AUTOPLAY_WEIGHTS[name] for name in FEATURES]
+    seeds = generation_seeds(args.seed, 0, args.games)
+    started = time.perf_counter()
+    results = run_matches([weights], seeds, args.max_pieces, args.workers)[0]
+    score, lines, pieces, topped_out = results.T
+    print(format_weights(weights))
+    print(
+        f"{len(seeds)} games: score mean {score.mean():.0f} "
+        f"(min {score.min()}, max {score.max()}), lines mean {lines.mean():.1f}, "
+        f"pieces mean {pieces.mean():.1f}, topped out {topped_out.sum()} "
+        f"({time.perf_counter() - started:.1f}s)"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Autoplayer self-play tournament")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--games", type=int, default=8, help="Seeded games each")
+    common.add_argument("--max-pieces", type=int, default=500)
+    common.add_argument("--workers", type=int, default=None)
+    common.add_argument("--seed", type=int, default=None, help="Default: 0")
+
+    search_parser = commands.add_parser("search", parents=[common])
+    search_parser.add_argument("--method", choices=METHODS, help="Default: cem")
+    search_parser.add_argument("--generations", type=int, default=20)
+    search_parser.add_argument("--population", type=int, default=32)
+    search_parser.add_argument("--elite", type=float, default=0.25)
+    search_parser.add_argument("--initial-std", type=float, help="Default: 0.5")
+    search_parser.add_argument("--noise", type=float, default=0.1)
+    search_parser.add_argument("--checkpoint", help="JSON file saved every generation")
+    search_parser.add_argument(
+        "--restart", action="store_true", help="Ignore an existing checkpoint"
+    )
+
+    eval_parser = commands.add_parser("eval", parents=[common])
+    eval_parser.add_argument(
+        "--weights", type=float, nargs=len(FEATURES), metavar="W", help=str(FEATURES)
+    )
+    args = parser.parse_args(argv)
+
+    state = None
+    if args.command == "search":
+        if args.checkpoint and os.path.exists(args.checkpoint) and not args.restart:
+            state = load_checkpoint(args.checkpoint)
+            conflicts = resume_conflicts(state, args)
+            if conflicts:
+                search_parser.error(
+                    f"{args.checkpoint} was started with other settings: "
+                    f"{', '.join(conflicts)}; drop them or pass --restart"
+                )
+    for key, default in DEFAULTS.items():
+        if getattr(args, key, default) is None:
+            setattr(args, key, default)
+
+    if args.command == "search":
+        search(args, state)
+    else:
+        evaluate(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@ class UIManager:
         self._main_menu_sound_played = (
             False  # Instance variable to track sound for main menu
         )
+        self._main_menu_background = None  # Composed once, see main_menu
 
     def _draw_volume_slider(self, y_pos, width=300):
         slider_x = Config.S_WIDTH // 2 - width // 2
@@ -49,7 +50,7 @@ class UIManager:
             self.surface, (255, 255, 255), (knob_x_pos, knob_center_y), knob_radius, 2
         )  # White border
 
-        self.renderer.draw_text(
+        label_rect = self.renderer.draw_text(
             f"Volume: {int(self.assets.volume*100)}%",
             24,
             (220, 220, 220),
@@ -57,6 +58,16 @@ class UIManager:
             knob_center_y,
             center_y=True,
         )
+        # Knob can sit half outside the bar at either end
+        slider_area = pygame.Rect(
+            slider_x - knob_radius,
+            knob_center_y - knob_radius,
+            width + knob_radius * 2,
+            knob_radius * 2,
+        )
+        self.renderer.track_region(
+            "volume_slider", self.assets.volume, slider_area.union(label_rect)
+        )
         # Return clickable area for the knob and slider properties for event handling
         return knob_rect, slider_x, width
 
@@ -87,14 +98,40 @@ class UIManager:
             new_volume = max(0.0, min(1.0, (mouse_pos[0] - slider_x) / slider_width))
             self.assets.set_volume(new_volume)
 
-    def main_menu(self):
-        if not self._main_menu_sound_played:
-            self.assets.play_sound("prepare")
-            self._main_menu_sound_played = (
-                True  # Ensure it plays only once per UIManager instance or app session
+    # --- Idle redraw ---
+    def _wait_events(self):
+        # Blocks until something happens, then drains whatever else is queued. Gives
+        # up after MENU_IDLE_TIMEOUT_MS with no events, so an idle menu costs nothing.
+        event = pygame.event.wait(Config.MENU_IDLE_TIMEOUT_MS)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def _hovered_action(self, buttons):
+        mouse_pos = pygame.mouse.get_pos()
+        for btn in buttons:
+            if btn["rect"].collidepoint(mouse_pos):
+                return btn["action"]
+        return None
+
+    def _draw_menu_buttons(self, buttons, hovered, slot, colors, border_color):
+        # colors: (normal, hovered) fill
+        for btn in buttons:
+            is_hovered = btn["action"] == hovered
+            self.renderer.track_region(slot + btn["action"], is_hovered, btn["rect"])
+            pygame.draw.rect(
+                self.surface, colors[is_hovered], btn["rect"], border_radius=5
             )
+            pygame.draw.rect(
+                self.surface, border_color, btn["rect"], 2, border_radius=5
+            )  # Border
 
-        running, clock = True, pygame.time.Clock()
+            # Center text on button
+            text_surf = btn["label_surface"]
+            text_rect = text_surf.get_rect(center=btn["rect"].center)
+            self.surface.blit(text_surf, text_rect)
+
+    def _compose_main_menu(self):
         title_font_size = 90
         option_font_size = 26
 
@@ -102,54 +139,77 @@ class UIManager:
         start_rect = pygame.Rect(Config.S_WIDTH / 2 - 150, 360, 300, 50)
         exit_rect = pygame.Rect(Config.S_WIDTH / 2 - 150, 430, 300, 50)
 
-        while running:
-            self.surface.fill((10, 10, 30))  # Dark blue background
-            self.renderer.draw_text(
-                "TETRIS",
-                title_font_size,
-                (255, 255, 255),
-                Config.S_WIDTH / 2,
-                180,
-                "impact",
-                True,
-                True,
-            )
-            self.renderer.draw_text(
-                "Are you ready to play?",
-                option_font_size - 5,
-                (200, 200, 255),
-                Config.S_WIDTH / 2,
-                280,
-                center_x=True,
-                center_y=True,
-            )
+        self.surface.fill((10, 10, 30))  # Dark blue background
+        self.renderer.draw_text(
+            "TETRIS",
+            title_font_size,
+            (255, 255, 255),
+            Config.S_WIDTH / 2,
+            180,
+            "impact",
+            True,
+            True,
+        )
+        self.renderer.draw_text(
+            "Are you ready to play?",
+            option_font_size - 5,
+            (200, 200, 255),
+            Config.S_WIDTH / 2,
+            280,
+            center_x=True,
+            center_y=True,
+        )
 
-            # Draw buttons (text for now, can be enhanced with rects)
-            pygame.draw.rect(self.surface, (0, 100, 200), start_rect, border_radius=5)
-            self.renderer.draw_text(
-                "Press SPACE to Start",
-                option_font_size,
-                (255, 255, 255),
-                start_rect.centerx,
-                start_rect.centery,
-                center_x=True,
-                center_y=True,
-            )
+        # Draw buttons (text for now, can be enhanced with rects)
+        pygame.draw.rect(self.surface, (0, 100, 200), start_rect, border_radius=5)
+        self.renderer.draw_text(
+            "Press SPACE to Start",
+            option_font_size,
+            (255, 255, 255),
+            start_rect.centerx,
+            start_rect.centery,
+            center_x=True,
+            center_y=True,
+        )
 
-            pygame.draw.rect(self.surface, (150, 0, 50), exit_rect, border_radius=5)
-            self.renderer.draw_text(
-                "Press ESC to Exit",
-                option_font_size,
-                (255, 255, 255),
-                exit_rect.centerx,
-                exit_rect.centery,
-                center_x=True,
-                center_y=True,
+        pygame.draw.rect(self.surface, (150, 0, 50), exit_rect, border_radius=5)
+        self.renderer.draw_text(
+            "Press ESC to Exit",
+            option_font_size,
+            (255, 255, 255),
+            exit_rect.centerx,
+            exit_rect.centery,
+            center_x=True,
+            center_y=True,
+        )
+        return self.surface.copy()
+
+    def draw_main_menu(self):
+        # One main menu frame; also the first frame --profile-startup times.
+        # Everything but the volume slider never changes, so it's composed once.
+        if self._main_menu_background is None:
+            self._main_menu_background = self._compose_main_menu()
+        self.surface.blit(self._main_menu_background, (0, 0))
+        slider = self._draw_volume_slider(Config.S_HEIGHT - 100)
+        self.assets.apply_volume()  # Once per redraw, not per motion event
+        self.renderer.present("main_menu")
+        return slider
+
+    def main_menu(self):
+        if not self._main_menu_sound_played:
+            self.assets.play_sound("prepare")
+            self._main_menu_sound_played = (
+                True  # Ensure it plays only once per UIManager instance or app session
             )
 
-            knob_r, sx, sw = self._draw_volume_slider(Config.S_HEIGHT - 100)
+        drawn = None  # State on screen; redraw only when it changes
+        while True:
+            state = self.assets.volume
+            if state != drawn:
+                knob_r, sx, sw = self.draw_main_menu()
+                drawn = state
 
-            for event in pygame.event.get():
+            for event in self._wait_events():
                 if event.type == pygame.QUIT:
                     return "exit"  # Signal to exit application
                 if event.type == pygame.KEYDOWN:
@@ -158,17 +218,17 @@ class UIManager:
                         return "start_game"
                     if event.key == pygame.K_ESCAPE:
                         return "exit"
+                if event.type == pygame.VIDEOEXPOSE:
+                    self.renderer.mark_full_redraw()
+                    drawn = None
                 self._handle_volume_slider_events(event, knob_r, sx, sw)
 
-            pygame.display.update()
-            clock.tick(30)
-        return "exit"  # Default return if loop broken unexpectedly
-
     def _create_menu_buttons(self, items, start_y, font_size=40, padding=70):
         buttons = []
-        font = self.assets.get_font("comicsans", font_size, bold=True)
         for i, (text, action) in enumerate(items):
-            label = font.render(text, True, (220, 220, 255))  # Light blue text
+            label = self.assets.render_text(
+                text, font_size, (220, 220, 255), "comicsans", True
+            )  # Light blue text
 
             # Create a rect for the button for collision detection and drawing
             rect_width = 300
@@ -182,11 +242,25 @@ class UIManager:
         return buttons
 
     def pause_menu(self):
-        paused, clock = True, pygame.time.Clock()
-
         # Create a semi-transparent overlay for the pause screen
         overlay = pygame.Surface((Config.S_WIDTH, Config.S_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))  # Black with alpha for transparency
+        # Compose the frozen game frame, the overlay and the title once; only the
+        # buttons and the slider are drawn over it again, when they change
+        background = self.surface.copy()
+        background.blit(overlay, (0, 0))
+        self.surface.blit(background, (0, 0))
+        self.renderer.draw_text(
+            "PAUSED",
+            70,
+            (255, 255, 255),
+            Config.S_WIDTH / 2,
+            Config.S_HEIGHT // 2 - 200,
+            "impact",
+            True,
+            True,
+        )
+        background = self.surface.copy()
 
         buttons = self._create_menu_buttons(
             [
@@ -198,41 +272,24 @@ class UIManager:
             font_size=35,
         )
 
-        while paused:
-            self.surface.blit(overlay, (0, 0))  # Draw overlay first
-
-            self.renderer.draw_text(
-                "PAUSED",
-                70,
-                (255, 255, 255),
-                Config.S_WIDTH / 2,
-                Config.S_HEIGHT // 2 - 200,
-                "impact",
-                True,
-                True,
-            )
-
-            mouse_pos = pygame.mouse.get_pos()
-            for btn in buttons:
-                button_color = (50, 50, 100)  # Default button color
-                if btn["rect"].collidepoint(mouse_pos):
-                    button_color = (80, 80, 150)  # Hover color
-
-                pygame.draw.rect(
-                    self.surface, button_color, btn["rect"], border_radius=5
+        drawn = None
+        while True:
+            state = (self.assets.volume, self._hovered_action(buttons))
+            if state != drawn:
+                self.surface.blit(background, (0, 0))
+                self._draw_menu_buttons(
+                    buttons,
+                    state[1],
+                    "pause_button:",
+                    ((50, 50, 100), (80, 80, 150)),  # Default, hover
+                    (150, 150, 200),
                 )
-                pygame.draw.rect(
-                    self.surface, (150, 150, 200), btn["rect"], 2, border_radius=5
-                )  # Border
-
-                # Center text on button
-                text_surf = btn["label_surface"]
-                text_rect = text_surf.get_rect(center=btn["rect"].center)
-                self.surface.blit(text_surf, text_rect)
+                knob_r, sx, sw = self._draw_volume_slider(Config.S_HEIGHT - 100)
+                self.assets.apply_volume()  # Once per redraw, not per motion event
+                self.renderer.present("pause_menu")
+                drawn = state
 
-            knob_r, sx, sw = self._draw_volume_slider(Config.S_HEIGHT - 100)
-
-            for event in pygame.event.get():
+            for event in self._wait_events():
                 if event.type == pygame.QUIT:
                     return "exit_game"  # Or "quit_application" if you want to close everything
                 if event.type == pygame.KEYDOWN:
@@ -244,17 +301,14 @@ class UIManager:
                         if btn["rect"].collidepoint(event.pos):
                             self.assets.play_sound("tap")
                             return btn["action"]
+                if event.type == pygame.VIDEOEXPOSE:
+                    self.renderer.mark_full_redraw()
+                    drawn = None
                 self._handle_volume_slider_events(event, knob_r, sx, sw)
 
-            pygame.display.update()
-            clock.tick(30)
-        return "resume"  # Default if loop breaks
-
     def game_over_screen(
         self, score, lines, time_survived_str
     ):  # time_survived is now string
-        running, clock = True, pygame.time.Clock()
-
         buttons = self._create_menu_buttons(
             [
                 ("Try Slots!", "play_slots"),
@@ -266,65 +320,64 @@ class UIManager:
             padding=60,
         )
 
-        while running:
-            self.surface.fill((30, 0, 0))  # Dark red background for game over
-            self.renderer.draw_text(
-                "GAME OVER",
-                80,
-                (200, 0, 0),
-                Config.S_WIDTH // 2,
-                100,
-                "impact",
-                True,
-                True,
-            )
-
-            stats_y_start = 180
-            self.renderer.draw_text(
-                f"Survival Time: {time_survived_str}",
-                30,
-                (220, 220, 220),
-                Config.S_WIDTH // 2,
-                stats_y_start,
-                center_x=True,
-            )
-            self.renderer.draw_text(
-                f"Lines Cleared: {lines}",
-                30,
-                (220, 220, 220),
-                Config.S_WIDTH // 2,
-                stats_y_start + 40,
-                center_x=True,
-            )
-            self.renderer.draw_text(
-                f"Final Score: {score}",
-                45,
-                (255, 220, 0),
-                Config.S_WIDTH // 2,
-                stats_y_start + 90,
-                "impact",
-                True,
-                True,
-            )
-
-            mouse_pos = pygame.mouse.get_pos()
-            for btn in buttons:
-                button_color = (100, 20, 20)
-                if btn["rect"].collidepoint(mouse_pos):
-                    button_color = (150, 30, 30)
+        # Title and stats are fixed for this screen, compose them once
+        self.surface.fill((30, 0, 0))  # Dark red background for game over
+        self.renderer.draw_text(
+            "GAME OVER",
+            80,
+            (200, 0, 0),
+            Config.S_WIDTH // 2,
+            100,
+            "impact",
+            True,
+            True,
+        )
 
-                pygame.draw.rect(
-                    self.surface, button_color, btn["rect"], border_radius=5
-                )
-                pygame.draw.rect(
-                    self.surface, (200, 100, 100), btn["rect"], 2, border_radius=5
+        stats_y_start = 180
+        self.renderer.draw_text(
+            f"Survival Time: {time_survived_str}",
+            30,
+            (220, 220, 220),
+            Config.S_WIDTH // 2,
+            stats_y_start,
+            center_x=True,
+        )
+        self.renderer.draw_text(
+            f"Lines Cleared: {lines}",
+            30,
+            (220, 220, 220),
+            Config.S_WIDTH // 2,
+            stats_y_start + 40,
+            center_x=True,
+        )
+        self.renderer.draw_text(
+            f"Final Score: {score}",
+            45,
+            (255, 220, 0),
+            Config.S_WIDTH // 2,
+            stats_y_start + 90,
+            "impact",
+            True,
+            True,
+        )
+        background = self.surface.copy()
+
+        drawn = None
+        while True:
+            state = (self._hovered_action(buttons),)
+            if state != drawn:
+                self.surface.blit(background, (0, 0))
+                self._draw_menu_buttons(
+                    buttons,
+                    state[0],
+                    "game_over_button:",
+                    ((100, 20, 20), (150, 30, 30)),
+                    (200, 100, 100),
                 )
+                self.renderer.present("game_over")
+                drawn = state
 
-                text_surf = btn["label_surface"]
-                text_rect = text_surf.get_rect(center=btn["rect"].center)
-                self.surface.blit(text_surf, text_rect)
-
-            for event in pygame.event.get():
+            for event in self._wait_events():
                 if event.type == pygame.QUIT:
                     return score, "exit_game"  # Return score and action
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -335,7 +388,6 @@ class UIManager:
                                 score,
                                 btn["action"],
                             )  # Return score and selected action
-
-            pygame.display.update()
-            clock.tick(30)
-        return score, "main_menu"  # Default return
+                if event.type == pygame.VIDEOEXPOSE:
+                    self.renderer.mark_full_redraw()
+                    drawn = None
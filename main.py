@@ -1,39 +1,89 @@
-import pygame
+from time import perf_counter_ns
 
-from game.config import Config
-from game.assets import AssetManager
-from game.renderer import Renderer
-from game.popup import PopupManager
-from game.ui import UIManager
-from game.tetris_game import TetrisGame
+STARTED_NS = perf_counter_ns()  # Before the imports, for --profile-startup
+
+import argparse  # noqa: E402
+import pygame  # noqa: E402
+
+from game.config import Config  # noqa: E402
+from game.assets import AssetManager  # noqa: E402
+from game.renderer import Renderer  # noqa: E402
+from game.popup import PopupManager  # noqa: E402
+from game.ui import UIManager  # noqa: E402
+from game.tetris_game import TetrisGame  # noqa: E402
+from game.replay import Replay, ReplayError  # noqa: E402
+from game.profiler import StartupProfiler  # noqa: E402
 
 # GameLogic and Piece are used by other modules, no direct import needed here if Application orchestrates.
 
 
 # --- Main Application ---
 class Application:
-    def __init__(self):
-        pygame.init()  # Initialize Pygame modules
+    def __init__(self, startup=None):
+        startup = StartupProfiler() if startup is None else startup
+        self.startup = startup
+        if Config.STARTUP_MINIMAL_INIT:
+            # Only what the menus and the game use; AssetManager starts the mixer
+            pygame.display.init()
+            pygame.font.init()
+        else:
+            pygame.init()  # Initialize Pygame modules
+        startup.mark("pygame init")
         self.surface = pygame.display.set_mode((Config.S_WIDTH, Config.S_HEIGHT))
         pygame.display.set_caption("Tetris Deluxe")  # Changed caption
+        startup.mark("display")
 
         # Initialize core components
         self.assets = AssetManager()
+        startup.mark("assets")
         self.renderer = Renderer(self.surface, self.assets)
         self.popup_manager = PopupManager(self.renderer)
         self.ui_manager = UIManager(self.surface, self.renderer, self.assets)
-        self.tetris_game = TetrisGame(
-            self.surface,
-            self.assets,
-            self.renderer,
-            self.ui_manager,
-            self.popup_manager,
-        )
+        self._tetris_game = None  # Built when first played, see tetris_game
+        startup.mark("components")
         # self.current_score = 0 # Score is managed within game states, not needed at app level like this
 
-    def run(self):
+    @property
+    def tetris_game(self):
+        if self._tetris_game is None:
+            self._tetris_game = TetrisGame(
+                self.surface,
+                self.assets,
+                self.renderer,
+                self.ui_manager,
+                self.popup_manager,
+            )
+        return self._tetris_game
+
+    def profile_startup(self):
+        # Draws the first main menu frame and reports where the time to it went
+        self.ui_manager.draw_main_menu()
+        self.startup.mark("first frame")
+        lines = self.startup.report()
+        sounds = self.assets.sound_stats()
+        source = sounds["bank"] or f"WAV files ({sounds['bank_error']})"
+        lines.append(
+            f"{sounds['loaded']}/{sounds['total']} sounds decoded by the first frame, "
+            f"from {source}"
+        )
+        if sounds["bank_stale"]:
+            stale = ", ".join(sounds["bank_stale"])
+            lines.append(f"Out of date in the bank, decoded from WAV: {stale}")
+        self.assets.wait_for_sounds()
+        lines.append(f"{'Sound':<24}{'load ms':>9}")
+        sounds = self.assets.sound_stats()
+        for name, ms in sounds["load_ms"].items():
+            lines.append(f"{name:<24}{ms:>9.2f}")
+        for name, error in sounds["errors"].items():
+            lines.append(f"{name:<24}{'failed':>9}  {error}")
+        pygame.quit()
+        return lines
+
+    def run(self, replay=None):
         current_view = "main_menu"
-        running = True
+        if replay is not None:  # Watch a recorded game first, then carry on as usual
+            current_view, _ = self.tetris_game.play_replay(replay)
+        running = current_view != "quit_application"
         last_score = 0  # To carry over score if needed, though Tetris usually resets
 
         while running:
@@ -63,6 +113,39 @@ class Application:
         pygame.quit()
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tetris Deluxe")
+    parser.add_argument("--replay", metavar="PATH", help="Play back a recorded game")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="With --replay: simulate at max speed without a window",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Time startup up to the first menu frame, print the breakdown and exit",
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    app = Application()
-    app.run()
+    args = parse_args()
+    if args.replay and args.headless:
+        from game import replay
+
+        raise SystemExit(replay.main([args.replay]))
+    game_replay = None
+    if args.replay:
+        # Before any window opens, so a bad file is just a message
+        try:
+            game_replay = Replay.load(args.replay)
+        except (OSError, ReplayError) as e:
+            raise SystemExit(f"{args.replay}: unreadable replay ({e})")
+    startup = StartupProfiler(STARTED_NS)
+    startup.mark("imports")
+    app = Application(startup)
+    if args.profile_startup:
+        print("\n".join(app.profile_startup()))
+    else:
+        app.run(game_replay)